@@ -0,0 +1,188 @@
+"""
+Bytes on the wire and server CPU time per chat turn of the Gradio front
+end, as a conversation grows.
+
+The app from gradio_script.py is served with a stand-in shopper that
+streams `--events` answers of the four agents per turn. The client acts
+like a browser: it applies the streamed diffs and sends back the inputs
+the page would.
+
+    python bench_gradio_stream.py --turns 40 --events 40
+    SHOPPER_UI_FPS=1000 python bench_gradio_stream.py   # unthrottled
+"""
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+from typing import AsyncGenerator
+import subprocess
+import logging
+import asyncio
+import click
+import httpx
+import json
+import time
+import uuid
+import sys
+import os
+
+AGENTS = [
+    "product_recommender_agent",
+    "price_tracker_agent",
+    "review_analysis_agent",
+    "E_Commerce_Personal_Shopper",
+]
+
+
+class StreamingStandIn(BaseAgent):
+    events: int = 40
+    interval: float = 0.025
+    size: int = 1500
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        for number in range(self.events):
+            await asyncio.sleep(self.interval)
+            text = f"{number} " + "lorem ipsum " * (self.size // 12)
+            yield Event(
+                author=AGENTS[number * len(AGENTS) // self.events],
+                invocation_id=ctx.invocation_id,
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+            )
+
+
+def serve(port: int, events: int):
+    from google.adk.runners import Runner
+    from shopper_runner import ShopperRunner
+    import gradio_script
+
+    # The stand-in answers as agents the runner doesn't know
+    logging.getLogger("google_adk").setLevel(logging.ERROR)
+    runner = Runner(
+        agent=StreamingStandIn(name="shopper", events=events),
+        app_name=gradio_script.APP_NAME,
+        session_service=gradio_script.SESSION_SERVICE,
+    )
+    gradio_script.SHOPPER = ShopperRunner(runner)
+    gradio_script.demo.launch(server_port=port)
+
+
+def apply_diff(value, edits: list):
+    # What the browser does with a streamed update
+    for action, path, change in edits:
+        if not path:
+            value = value + change if action == "append" else change
+            continue
+        target = value
+        for key in path[:-1]:
+            target = target[key]
+        if action == "replace":
+            target[path[-1]] = change
+        elif action == "append":
+            target[path[-1]] += change
+        elif action == "add":
+            if isinstance(target, list):
+                target.insert(path[-1], change)
+            else:
+                target[path[-1]] = change
+        elif action == "delete":
+            del target[path[-1]]
+    return value
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as stat:
+        fields = stat.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def turn(
+    client: httpx.Client,
+    url: str,
+    config: dict,
+    values: dict,
+    session: str,
+    text: str,
+) -> tuple[int, int, int]:
+    dependency = config["dependencies"][0]
+    textbox = dependency["inputs"][0]
+    data = [text if i == textbox else values.get(i) for i in dependency["inputs"]]
+    body = json.dumps(
+        {"data": data, "fn_index": 0, "session_hash": session, "trigger_id": None}
+    )
+    client.post(
+        f"{url}gradio_api/queue/join",
+        content=body,
+        headers={"Content-Type": "application/json"},
+    )
+
+    received, updates = 0, 0
+    with client.stream(
+        "GET", f"{url}gradio_api/queue/data", params={"session_hash": session}
+    ) as stream:
+        for line in stream.iter_lines():
+            received += len(line) + 1
+            if not line.startswith("data:"):
+                continue
+            message = json.loads(line[5:])
+            output = message.get("output", {}).get("data")
+            if message["msg"] == "process_generating":
+                # The first update of a turn is whole, the rest are diffs
+                for i, change in zip(dependency["outputs"], output):
+                    if updates:
+                        change = apply_diff(values.get(i), change)
+                    values[i] = change
+                updates += 1
+            elif message["msg"] == "process_completed":
+                for i, value in zip(dependency["outputs"], output or []):
+                    values[i] = value
+                break
+    return len(body), received, updates
+
+
+@click.command()
+@click.option("--turns", "turns", default=40)
+@click.option("--events", "events", default=40)
+@click.option("--every", "every", default=5)
+@click.option("--port", "port", default=8091)
+@click.option("--serve", "serve_only", is_flag=True, default=False, hidden=True)
+def main(turns, events, every, port, serve_only):
+    if serve_only:
+        serve(port, events)
+        return
+
+    url = f"http://127.0.0.1:{port}/"
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--port", str(port)]
+        + ["--events", str(events)]
+    )
+    try:
+        with httpx.Client(timeout=60) as client:
+            for _ in range(120):
+                try:
+                    config = client.get(f"{url}config").json()
+                    break
+                except httpx.HTTPError:
+                    time.sleep(0.5)
+            session, values = uuid.uuid4().hex[:10], {}
+            print(f"{'turn':>5}{'sent KB':>9}{'recv KB':>9}{'updates':>9}{'CPU ms':>8}")
+            for number in range(1, turns + 1):
+                cpu = cpu_seconds(server.pid)
+                sent, received, updates = turn(
+                    client, url, config, values, session, f"query {number}"
+                )
+                cpu = cpu_seconds(server.pid) - cpu
+                if number == 1 or number % every == 0:
+                    print(
+                        f"{number:>5}{sent / 1024:>9.1f}{received / 1024:>9.1f}"
+                        f"{updates:>9}{cpu * 1000:>8.0f}"
+                    )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Prompt tokens and latency of the personal shopper turn by turn, with and
+without history compaction.
+
+Remote agents are stand-ins answering with texts of a typical size. The
+model is a stand-in too, taking `--prefill` tokens per second like a
+CPU-hosted Llama reading its prompt, unless `--ollama` is given.
+
+    python bench_history.py --turns 10
+    python bench_history.py --turns 6 --ollama
+"""
+
+from google.adk.agents import BaseAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from history import HistoryCompactor, estimate_tokens
+from typing import AsyncGenerator
+import asyncio
+import click
+
+# Characters each remote agent answers with
+ANSWER_SIZES = {
+    "product_recommender_agent": 2000,
+    "price_tracker_agent": 3000,
+    "review_analysis_agent": 2500,
+}
+
+
+class StandInAgent(BaseAgent):
+    size: int = 2000
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        question = ctx.user_content.parts[0].text
+        text = f"{self.name} on {question}: " + "details " * (self.size // 8)
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+        )
+
+
+class PrefillModel(BaseLlm):
+    model: str = "stand-in"
+    prefill: float = 500.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        system = llm_request.config.system_instruction or ""
+        tokens = estimate_tokens(llm_request.contents, str(system))
+        await asyncio.sleep(tokens / self.prefill)
+        yield LlmResponse(
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text="The first one is better value. " * 25)],
+            ),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=tokens
+            ),
+        )
+
+
+async def conversation(
+    turns: int, compactor: HistoryCompactor, model: BaseLlm
+) -> list[dict]:
+    from orchestrator import e_commerce_personal_shopper
+
+    shopper = e_commerce_personal_shopper.model_copy(
+        update={
+            "model": model,
+            "parent_agent": None,
+            "before_model_callback": compactor.before_model,
+            "after_model_callback": compactor.after_model,
+        }
+    )
+    agents = [StandInAgent(name=name, size=size) for name, size in ANSWER_SIZES.items()]
+    workflow = SequentialAgent(name="Personal_Shopper", sub_agents=agents + [shopper])
+    runner = Runner(
+        agent=workflow,
+        app_name="bench",
+        session_service=InMemorySessionService(),
+    )
+    await runner.session_service.create_session(
+        app_name="bench", user_id="user", session_id="session"
+    )
+    for turn in range(1, turns + 1):
+        message = f"Suggest phone number {turn} under 20000"
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        async for _ in runner.run_async(
+            user_id="user", session_id="session", new_message=content
+        ):
+            pass
+    return compactor.stats()
+
+
+@click.command()
+@click.option("--turns", "turns", default=10)
+@click.option("--prefill", "prefill", default=500.0)
+@click.option("--ollama", "ollama", is_flag=True, default=False)
+def main(turns, prefill, ollama):
+    if ollama:
+        from orchestrator import model
+    else:
+        model = PrefillModel(prefill=prefill)
+
+    # Without compaction: everything kept, nothing over budget
+    uncompacted = HistoryCompactor(budget=10**9, keep_turns=10**6)
+    full = asyncio.run(conversation(turns, uncompacted, model))
+    compacted = asyncio.run(conversation(turns, HistoryCompactor(), model))
+
+    print(f"{'':>5}{'full history':>22}{'compacted':>22}")
+    print(f"{'turn':>5}" + f"{'prompt tok':>12}{'latency s':>10}" * 2)
+    for before, after in zip(full, compacted):
+        print(
+            f"{before['turns']:>5}"
+            f"{before['prompt_tokens']:>12}{before['latency']:>10.2f}"
+            f"{after['prompt_tokens']:>12}{after['latency']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Latency of repeated identical LLM calls with the completion cache, through
+ADK's LiteLlm as the orchestrator calls it and through litellm.completion
+as crewai's LLM does in the price tracker.
+
+Needs Ollama with the model of requirements/Modelfile_cpu_llama3_1, or the
+stand-in of ollama_stand_in.py. The first round of calls is answered by the
+model, the rest from the cache.
+
+    python bench_llm_cache.py --rounds 3
+    python bench_llm_cache.py --db /tmp/llm_cache.sqlite3   # start cold
+    python bench_llm_cache.py --model ollama_chat/llama3.2 --base-url URL
+
+Against the stand-in, each call taking 8 s:
+
+    python ollama_stand_in.py --port 11435 --load 0 --answer 8 &
+    python bench_llm_cache.py --base-url http://localhost:11435 \
+        --db /tmp/llm_cache.sqlite3
+"""
+
+from google.adk.models import LlmRequest
+from google.adk.models.lite_llm import LiteLlm
+from google.genai import types
+import asyncio
+import litellm
+import click
+import time
+import os
+
+PROMPT = "Suggest two phones under 20000 with a good camera, one line each."
+
+
+async def adk_call(model_name: str, base_url: str) -> float:
+    model = LiteLlm(model=model_name, base_url=base_url)
+    request = LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part(text=PROMPT)])],
+        config=types.GenerateContentConfig(system_instruction="Answer briefly."),
+    )
+    start = time.perf_counter()
+    async for _ in model.generate_content_async(request, stream=True):
+        pass
+    return time.perf_counter() - start
+
+
+async def crewai_call(model_name: str, base_url: str) -> float:
+    start = time.perf_counter()
+    await asyncio.to_thread(
+        litellm.completion,
+        model=model_name,
+        api_base=base_url,
+        temperature=0.0,
+        messages=[{"role": "user", "content": PROMPT}],
+    )
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--rounds", "rounds", default=3)
+@click.option("--model", "model", default="ollama_chat/llama3.1-cpu-custom")
+@click.option("--base-url", "base_url", default="http://localhost:11434")
+@click.option("--db", "db", default=None)
+def main(rounds, model, base_url, db):
+    os.environ["LLM_CACHE"] = "1"
+    if db:
+        os.environ["LLM_CACHE_DB"] = db
+    # Read the environment only now
+    from llm_cache import completion_cache_stats, install_completion_cache
+
+    install_completion_cache()
+
+    async def run():
+        print(f"{'round':>6}{'ADK LiteLlm s':>15}{'crewai LLM s':>14}")
+        for number in range(1, rounds + 1):
+            adk = await adk_call(model, base_url)
+            crewai = await crewai_call(model, base_url)
+            print(f"{number:>6}{adk:>15.3f}{crewai:>14.3f}")
+            # Streamed answers are stored once the stream has been logged
+            await asyncio.sleep(0.5)
+
+    asyncio.run(run())
+    print(completion_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
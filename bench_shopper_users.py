@@ -0,0 +1,90 @@
+"""
+Many simulated users chatting with the shopper at once, for a range of
+SHOPPER_CONCURRENCY limits.
+
+The shopper is a stand-in that waits on "remote agents" for a fixed time
+and answers with the number of events in its context, so the numbers show
+queueing and session isolation without the agents or the LLM.
+
+    python bench_shopper_users.py --users 32 --turns 3 --concurrency 1,4,16
+    python bench_shopper_users.py --shared   # one session for everyone
+"""
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from shopper_runner import ShopperRunner
+from typing import AsyncGenerator
+import statistics
+import asyncio
+import click
+import time
+
+
+class StandInShopper(BaseAgent):
+    latency: float = 0.5
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        await asyncio.sleep(self.latency)
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(
+                role="model", parts=[types.Part(text=str(len(ctx.session.events)))]
+            ),
+        )
+
+
+async def simulate(
+    users: int, turns: int, concurrency: int, latency: float, shared: bool
+) -> tuple[float, list[float], int]:
+    runner = Runner(
+        agent=StandInShopper(name="shopper", latency=latency),
+        app_name="bench",
+        session_service=InMemorySessionService(),
+    )
+    shopper = ShopperRunner(runner, concurrency)
+
+    async def user(number: int) -> tuple[list[float], int]:
+        session_id = "default_session" if shared else f"session_{number}"
+        latencies, context = [], 0
+        for turn in range(turns):
+            start = time.perf_counter()
+            async for event in shopper.run("user", session_id, f"query {turn}"):
+                context = max(context, int(event.content.parts[0].text))
+            latencies.append(time.perf_counter() - start)
+        return latencies, context
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(user(number) for number in range(users)))
+    elapsed = time.perf_counter() - start
+    latencies = [latency for user_latencies, _ in results for latency in user_latencies]
+    return elapsed, latencies, max(context for _, context in results)
+
+
+@click.command()
+@click.option("--users", "users", default=32)
+@click.option("--turns", "turns", default=3)
+@click.option("--concurrency", "concurrency", default="1,2,4,8,16,32")
+@click.option("--latency", "latency", default=0.5)
+@click.option("--shared", "shared", is_flag=True, default=False)
+def main(users, turns, concurrency, latency, shared):
+    print(f"{'limit':>6}{'turns/s':>9}{'p50 s':>8}{'p95 s':>8}  max context events")
+    for limit in [int(c) for c in concurrency.split(",")]:
+        elapsed, latencies, context = asyncio.run(
+            simulate(users, turns, limit, latency, shared)
+        )
+        quantiles = statistics.quantiles(latencies, n=20)
+        print(
+            f"{limit:>6}{len(latencies) / elapsed:>9.1f}"
+            f"{statistics.median(latencies):>8.2f}{quantiles[18]:>8.2f}  {context}"
+        )
+
+
+if __name__ == "__main__":
+    main()
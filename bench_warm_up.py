@@ -0,0 +1,78 @@
+"""
+First-request latency of the orchestrator's model, with the model unloaded
+from Ollama (cold) and after the startup warm-up (warm).
+
+Needs Ollama with the model of requirements/Modelfile_cpu_llama3_1, or the
+stand-in of ollama_stand_in.py. Each round unloads the model first, so
+nothing else should be using it.
+
+    python bench_warm_up.py --rounds 3
+    python bench_warm_up.py --model llama3.2 --base-url URL
+
+Against the stand-in, loading the model in 4 s and answering in 1 s:
+
+    python ollama_stand_in.py --port 11435 --load 4 --answer 1 &
+    python bench_warm_up.py --base-url http://localhost:11435
+"""
+
+from google.adk.models import LlmRequest
+from google.adk.models.lite_llm import LiteLlm
+from google.genai import types
+import asyncio
+import click
+import time
+import os
+
+
+def unload():
+    from ollama_client import OLLAMA_MODEL, OLLAMA_URL, sync_client
+
+    sync_client().client.post(
+        f"{OLLAMA_URL}/api/generate", json={"model": OLLAMA_MODEL, "keep_alive": 0}
+    ).raise_for_status()
+
+
+async def first_request(model: LiteLlm, number: int) -> float:
+    # A new question each time, so no completion cache can answer it
+    text = f"Name one phone under {10000 + number * 1000} rupees."
+    request = LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+        config=types.GenerateContentConfig(system_instruction="Answer briefly."),
+    )
+    start = time.perf_counter()
+    async for _ in model.generate_content_async(request):
+        pass
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--rounds", "rounds", default=3)
+@click.option("--model", "model_name", default="llama3.1-cpu-custom")
+@click.option("--base-url", "base_url", default="http://localhost:11434")
+def main(rounds, model_name, base_url):
+    os.environ["OLLAMA_URL"] = base_url
+    os.environ["OLLAMA_MODEL"] = model_name
+    # Read the environment only now
+    from ollama_client import LLM_MODEL, llm_options, readiness, warm_up
+
+    model = LiteLlm(model=LLM_MODEL, **llm_options())
+
+    async def run():
+        print(f"{'round':>6}{'cold s':>9}{'warm-up s':>11}{'warm s':>9}  ready")
+        for number in range(1, rounds + 1):
+            await asyncio.to_thread(unload)
+            cold = await first_request(model, 2 * number)
+
+            await asyncio.to_thread(unload)
+            start = time.perf_counter()
+            await asyncio.to_thread(warm_up)
+            loading = time.perf_counter() - start
+            ready = (await readiness())["ready"]
+            warm = await first_request(model, 2 * number + 1)
+            print(f"{number:>6}{cold:>9.2f}{loading:>11.2f}{warm:>9.2f}  {ready}")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from google.adk.agents import ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+from pydantic import Field
+from typing import AsyncGenerator
+import logging
+import asyncio
+import time
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Seconds each remote agent gets before its results are given up on
+AGENT_DEADLINES = {
+    "product_recommender_agent": float(os.getenv("RECOMMENDER_DEADLINE", "60")),
+    "price_tracker_agent": float(os.getenv("PRICE_TRACKER_DEADLINE", "90")),
+    "review_analysis_agent": float(os.getenv("REVIEW_ANALYSIS_DEADLINE", "60")),
+}
+DEFAULT_DEADLINE = float(os.getenv("ORCHESTRATOR_AGENT_DEADLINE", "90"))
+# End to end budget per user turn, part of it is kept for the shopper's answer
+LATENCY_BUDGET = float(os.getenv("ORCHESTRATOR_LATENCY_BUDGET", "150"))
+SHOPPER_RESERVE = float(os.getenv("ORCHESTRATOR_SHOPPER_RESERVE", "30"))
+
+
+def invocation_start(ctx: InvocationContext) -> float:
+    # The user's message is the first event of the invocation
+    for event in ctx.session.events:
+        if event.invocation_id == ctx.invocation_id:
+            return event.timestamp
+    return time.time()
+
+
+def remaining_budget(
+    ctx: InvocationContext,
+    budget: float = LATENCY_BUDGET,
+    reserve: float = SHOPPER_RESERVE,
+) -> float:
+    return max(0.0, invocation_start(ctx) + budget - reserve - time.time())
+
+
+def missing_result(name: str, reason: str) -> str:
+    return f"[{name} results missing: {reason}]"
+
+
+def is_missing(text: str) -> bool:
+    return text.startswith("[") and " results missing: " in text
+
+
+def missing_event(
+    ctx: InvocationContext, name: str, reason: str, branch: str | None = None
+) -> Event:
+    return Event(
+        author=name,
+        invocation_id=ctx.invocation_id,
+        branch=branch or ctx.branch,
+        content=types.Content(
+            role="model", parts=[types.Part(text=missing_result(name, reason))]
+        ),
+    )
+
+
+class DeadlineParallelAgent(ParallelAgent):
+    """
+    ParallelAgent that stops waiting on sub-agents past their deadline.
+
+    Every sub-agent gets its own deadline, capped by what is left of the
+    turn's latency budget. A sub-agent that runs out of time, or fails, is
+    cancelled and a "results missing" event is posted in its name, so the
+    next stage goes ahead with whatever did arrive.
+    """
+
+    deadlines: dict[str, float] = Field(
+        default_factory=lambda: dict(AGENT_DEADLINES)
+    )
+    budget: float = LATENCY_BUDGET
+    reserve: float = SHOPPER_RESERVE
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        stage_left = remaining_budget(ctx, self.budget, self.reserve)
+        sentinel = object()
+        queue = asyncio.Queue()
+
+        async def drain(sub_agent, sub_ctx: InvocationContext, answered: list):
+            events = sub_agent.run_async(sub_ctx)
+            try:
+                async for event in events:
+                    resume = asyncio.Event()
+                    await queue.put((event, resume))
+                    # Wait until the runner has stored the event
+                    await resume.wait()
+                    if event.content and event.content.parts:
+                        answered.append(event)
+            finally:
+                await events.aclose()
+
+        async def run(sub_agent):
+            sub_ctx = ctx.model_copy()
+            suffix = f"{self.name}.{sub_agent.name}"
+            sub_ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+            timeout = min(
+                self.deadlines.get(sub_agent.name, DEFAULT_DEADLINE), stage_left
+            )
+            answered = []
+            reason = None
+            try:
+                await asyncio.wait_for(drain(sub_agent, sub_ctx, answered), timeout)
+            except asyncio.TimeoutError:
+                reason = f"no answer within {round(timeout, 1):g}s"
+            except Exception as e:
+                reason = f"failed ({e})"
+
+            if not answered:
+                reason = reason or "no results returned"
+                logger.warning(f"{sub_agent.name}: {reason}")
+                event = missing_event(ctx, sub_agent.name, reason, sub_ctx.branch)
+                await queue.put((event, None))
+            await queue.put((sentinel, None))
+
+        tasks = [asyncio.create_task(run(agent)) for agent in self.sub_agents]
+        try:
+            finished = 0
+            while finished < len(tasks):
+                event, resume = await queue.get()
+                if event is sentinel:
+                    finished += 1
+                    continue
+                yield event
+                if resume:
+                    resume.set()
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -5,185 +5,213 @@ Licensed under the Apache License, Version 2.0
 
 import gradio as gr
 import asyncio
-from orchestrator import personal_shopper
+from orchestrator import personal_shopper, router
+from ollama_client import readiness, start_warm_up
+from shopper_runner import SHOPPER_CONCURRENCY, ShopperRunner
 from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 from google.adk.events import Event
 from typing import AsyncIterator
-from google.genai import types
+from fastapi.responses import JSONResponse
 
 import logging
 import json
+import time
 import os
 
 APP_NAME = "e_commerce_shopper_app"
 USER_ID = "default_user"
-SESSION_ID = "default_session"
+# Users whose message waits in the queue, past that new ones are turned away
+SHOPPER_QUEUE_SIZE = int(os.getenv("SHOPPER_QUEUE_SIZE", "64"))
+# UI updates per second while an answer streams in, the last one always goes
+UI_FPS = float(os.getenv("SHOPPER_UI_FPS", "4"))
+# Turns shown and kept per browser tab, and tabs kept by the server
+CHAT_TURNS = int(os.getenv("SHOPPER_CHAT_TURNS", "20"))
+MAX_UI_SESSIONS = int(os.getenv("SHOPPER_MAX_UI_SESSIONS", "1000"))
 SESSION_SERVICE = InMemorySessionService()
 E_COMMERCE_SHOPPER_AGENT_RUNNER = Runner(
     agent=personal_shopper,
     app_name=APP_NAME,
     session_service=SESSION_SERVICE,
 )
+SHOPPER = ShopperRunner(E_COMMERCE_SHOPPER_AGENT_RUNNER, SHOPPER_CONCURRENCY)
 
 
-async def get_response_from_agent(
-    message: str,
-    log_history: list[str] = None,
-    chat_history: list[tuple[str, str]] = None,
-):
-
-    chat_history = chat_history or []
-    updated_chat = chat_history + [(message, None)]
-
-    # Yield instantly with new user message and cleared input
-    yield (
-        gr.update(choices=None),
-        updated_chat,
-        gr.HTML(""),  # no progress yet
-        gr.update(value="", interactive=False, placeholder="Processing..."),
-        gr.update(value={}),
-        gr.update(value=""),
-    )
-
-    await asyncio.sleep(0)  # allow UI to update before backend starts
-
-    log_history = log_history or []
-    chat_history = chat_history or []
-
-    progress_value = 0.1
-    # As we have 4 agents, every agents increases the progess by 25%
-    progress_increment = 0.25
-
-    # Initial yield to show progress
-    progress_html = f"""
+def progress_bar(label: str, value: float, done: bool = False) -> str:
+    icon, color = ("checkmark", "green") if done else ("spinner", "orange")
+    return f"""
     <div style='margin-top:8px; display:flex; flex-direction:column; gap:6px;'>
         <div style='display:flex; align-items:center; gap:6px;'>
-            <div class='spinner'></div>
-            <label><b>Processing User Query...</b></label>
+            <div class='{icon}'></div>
+            <label><b>{label}</b></label>
         </div>
         <div style='display:flex; align-items:center; gap:8px;'>
-            <progress value='{progress_value}' max='1' 
-                style='width:100%; height:12px; accent-color: solid orange;'></progress>
+            <progress value='{value}' max='1' 
+                style='width:100%; height:12px; accent-color: {color};'></progress>
             <span style='min-width:40px; text-align:right; font-weight:bold; color:#444;'>
-                {(progress_value*100):.0f}%
+                {(value*100):.0f}%
             </span>
         </div>
     </div>
     """
 
-    # Refresh dropdown only at the start of a new query
-    yield (
-        gr.update(choices=[]),  # clear dropdown before starting
-        [],  # keep chat
-        gr.HTML(progress_html),
-        "",  # clear input box
-        {},  # reset delegated outputs
-        "",  # clear delegation info
-    )
-    await asyncio.sleep(0.05)
 
-    await SESSION_SERVICE.create_session(
-        app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
-    )
+async def frames(
+    events: AsyncIterator[Event], interval: float
+) -> AsyncIterator[list[Event]]:
+    """Events in batches, at most one batch every `interval` seconds."""
+    queue = asyncio.Queue()
+    finished = object()
+
+    async def drain():
+        # The runner is iterated in one task, frames are timed in another
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(e)
+        await queue.put(finished)
+
+    task = asyncio.create_task(drain())
+    batch, last_frame = [], 0.0
+    try:
+        while True:
+            wait = max(0.0, last_frame + interval - time.monotonic())
+            try:
+                item = await asyncio.wait_for(queue.get(), wait if batch else None)
+            except asyncio.TimeoutError:
+                item = None
+            if item is finished:
+                break
+            if isinstance(item, Exception):
+                raise item
+            if item is not None:
+                batch.append(item)
+            if batch and time.monotonic() - last_frame >= interval:
+                yield batch
+                batch, last_frame = [], time.monotonic()
+        if batch:
+            yield batch
+    finally:
+        task.cancel()
+
+
+async def get_response_from_agent(
+    message: str,
+    chat_history: list[tuple[str, str]] = None,
+    request: gr.Request = None,
+):
+    # Every page load gets its own ADK session
+    session_id = request.session_hash
+    # Only the latest turns are kept, and sent, per browser tab
+    chat = (chat_history or [])[-(CHAT_TURNS - 1) :] if CHAT_TURNS > 1 else []
+    chat.append((message, None))
+
+    progress_value = 0.1
+    # As we have 4 agents, every agents increases the progess by 25%
+    progress_increment = 0.25
 
-    events_iterator: AsyncIterator[Event] = E_COMMERCE_SHOPPER_AGENT_RUNNER.run_async(
-        user_id=USER_ID,
-        session_id=SESSION_ID,
-        new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+    status = "Processing User Query..."
+    if SHOPPER.full:
+        status = f"Waiting for a free slot, {SHOPPER.waiting} ahead..."
+
+    # Yield instantly with new user message, cleared input and progress
+    yield (
+        gr.update(choices=[], value=None),
+        chat,
+        progress_bar(status, progress_value),
+        gr.update(value="", interactive=False, placeholder="Processing..."),
+        {},
+        "",
+        chat,
     )
 
+    events_iterator: AsyncIterator[Event] = SHOPPER.run(USER_ID, session_id, message)
+
     delegated_outputs = {}
     delegated_outputs["last_user_message"] = message
+    delegated_outputs["_agent_name_map"] = {}
     log_response = []  # fresh dropdown entries
     final_response = ""
     log_messages = []
+    readable_name = None
 
-    progress_value = 0.1
-    progress_increment = 0.25
+    async for batch in frames(events_iterator, 1 / UI_FPS):
+        text_response = ""
+        for event in batch:
+            progress_value = min(progress_value + progress_increment, 1.0)
+            responses = []
+            agent_name = event.author
+
+            if event.content and event.content.parts:
+                for part in event.content.parts:
+                    if part.text:
+                        responses.append(part.text)
+                        final_response = part.text
 
-    async for event in events_iterator:
-        progress_value = min(progress_value + progress_increment, 1.0)
-        responses = []
-        agent_name = getattr(event, "author", None) or event.__dict__.get("author")
+            event_text = "\n".join(responses).strip()
+            if not event_text:
+                continue
+            text_response = event_text
 
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                if part.text:
-                    responses.append(part.text)
-                    final_response = part.text
+            # Always store the agent’s response
+            delegated_outputs[agent_name] = text_response
+
+            # Maintain internal-to-readable mapping
+            readable_name = agent_name.replace("_", " ").title()
+            delegated_outputs["_agent_name_map"][readable_name] = agent_name
+
+            if readable_name not in log_response:
+                log_response.append(readable_name)
+                log_messages.append(f"\n⚙️ Delegated To: {readable_name}")
 
-        text_response = "\n".join(responses).strip()
         if not text_response:
             continue
 
-        # Always store the agent’s response
-        delegated_outputs[agent_name] = text_response
-
-        # Maintain internal-to-readable mapping
-        if "_agent_name_map" not in delegated_outputs:
-            delegated_outputs["_agent_name_map"] = {}
-
-        readable_name = agent_name.replace("_", " ").title()
-        delegated_outputs["_agent_name_map"][readable_name] = agent_name  # reverse map
-
-        if readable_name not in log_response:
-            log_response.append(readable_name)
-            log_messages.append(f"\n⚙️ Delegated To: {readable_name}")
-
-        # Custom progress bar with spinner
-        progress_html = f"""
-        <div style='margin-top:8px; display:flex; flex-direction:column; gap:6px;'>
-            <div style='display:flex; align-items:center; gap:6px;'>
-                <div class='spinner'></div>
-                <label><b>Received Response from {readable_name}...</b></label>
-            </div>
-            <div style='display:flex; align-items:center; gap:8px;'>
-                <progress value='{progress_value}' max='1' 
-                    style='width:100%; height:12px; accent-color: orange;'></progress>
-                <span style='min-width:40px; text-align:right; font-weight:bold; color:#444;'>
-                    {(progress_value*100):.0f}%
-                </span>
-            </div>
-        </div>
-        """
-
+        # Only the last message changes, Gradio sends the difference
+        chat[-1] = (message, text_response)
         yield (
-            gr.update(choices=log_response, value=readable_name),  # use readable name
-            chat_history + [(message, text_response)],
-            gr.HTML(progress_html),
-            "",  # clear textbox
+            gr.update(choices=log_response, value=readable_name),
+            chat,
+            progress_bar(f"Received Response from {readable_name}...", progress_value),
+            gr.skip(),
             delegated_outputs,
             "\n".join(log_messages),
+            gr.skip(),
         )
 
-    # Final yield
-    progress_html = """
-    <div style='margin-top:8px; display:flex; flex-direction:column; gap:6px;'>
-        <div style='display:flex; align-items:center; gap:6px;'>
-            <div class='checkmark'></div>
-            <label><b>Response Generated Successfully!</b></label>
-        </div>
-        <div style='display:flex; align-items:center; gap:8px;'>
-            <progress value='1' max='1' 
-                style='width:100%; height:12px; accent-color: green;'></progress>
-            <span style='min-width:40px; text-align:right; font-weight:bold; color:green;'>100%</span>
-        </div>
-    </div>
-    """
-
+    chat[-1] = (message, final_response)
     yield (
         gr.update(choices=log_response, value=readable_name),
-        chat_history + [(message, final_response)],
-        gr.HTML(progress_html),
+        chat,
+        progress_bar("Response Generated Successfully!", 1, done=True),
         gr.update(
             value="", interactive=True, placeholder="Type your next question here..."
         ),
         delegated_outputs,
         "\n".join(log_messages),
+        chat,
+    )
+
+
+async def end_session(request: gr.Request):
+    # The tab was closed or reloaded, its session is not used again
+    await SESSION_SERVICE.delete_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id=request.session_hash
     )
 
 
+async def ready() -> JSONResponse:
+    # 200 once the model is loaded in Ollama, for load balancers and scripts
+    status = await readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+async def stats() -> JSONResponse:
+    # Queueing of the shopper, and load and routing of each agent's replicas
+    return JSONResponse({"shopper": SHOPPER.stats(), "replicas": router.stats()})
+
+
 def show_delegated_output(selected_agent, delegated_outputs):
     """Show both the user query and the selected agent's response."""
 
@@ -245,11 +273,13 @@ with gr.Blocks(css=css) as demo:
             msg = gr.Textbox(label="Your message", elem_id="msg-box")
 
     delegated_outputs_state = gr.State({})
+    # The chat as the server last sent it, the browser doesn't send it back
+    chat_state = gr.State([])
 
     # When user sends message
     msg.submit(
         get_response_from_agent,
-        [msg, log_box, chat_box],
+        [msg, chat_state],
         [
             log_box,
             chat_box,
@@ -257,13 +287,30 @@ with gr.Blocks(css=css) as demo:
             msg,
             delegated_outputs_state,
             delegation_info,
+            chat_state,
         ],
+        # ShopperRunner limits the turns, so queued users can be told so
+        concurrency_limit=None,
     )
 
-    log_box.change(
+    # Only a pick by the user, not every update while streaming
+    log_box.input(
         show_delegated_output,
         [log_box, delegated_outputs_state],
         chat_box,
     )
+    demo.unload(end_session)
+
+demo.queue(max_size=SHOPPER_QUEUE_SIZE)
 
-demo.launch(server_name="0.0.0.0", server_port=8081)
+if __name__ == "__main__":
+    start_warm_up()
+    demo.launch(
+        server_name="0.0.0.0",
+        server_port=8081,
+        state_session_capacity=MAX_UI_SESSIONS,
+        prevent_thread_lock=True,
+    )
+    demo.app.add_api_route("/ready", ready)
+    demo.app.add_api_route("/stats", stats)
+    demo.block_thread()
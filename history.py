@@ -0,0 +1,187 @@
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from collections import deque
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Earlier turns sent as they were, older ones only as a summary line
+KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", "2"))
+SUMMARY_CHARS = int(os.getenv("HISTORY_SUMMARY_CHARS", "300"))
+# Prompt tokens each LLM agent may send, Ollama's context is 4096 by default
+AGENT_TOKEN_BUDGETS = {
+    "E_Commerce_Personal_Shopper": int(os.getenv("SHOPPER_TOKEN_BUDGET", "3000")),
+}
+DEFAULT_TOKEN_BUDGET = int(os.getenv("AGENT_TOKEN_BUDGET", "3000"))
+# Rough size of a Llama token in English text
+CHARS_PER_TOKEN = 4
+# Inputs of the current turn are never shortened below this
+MIN_PART_CHARS = 400
+SHORTENED = " [...]"
+
+
+def _text(content: types.Content) -> str:
+    return "\n".join(part.text for part in content.parts or [] if part.text)
+
+
+def estimate_tokens(contents: list[types.Content], system: str = "") -> int:
+    chars = len(system) + sum(len(_text(content)) for content in contents)
+    return chars // CHARS_PER_TOKEN
+
+
+def split_turns(
+    contents: list[types.Content], questions: list[types.Content]
+) -> list[list[types.Content]]:
+    # A turn starts at one of the user's own messages
+    turns = []
+    for content in contents:
+        if not turns or (content.role == "user" and content in questions):
+            turns.append([])
+        turns[-1].append(content)
+    return turns
+
+
+def summarize(turn: list[types.Content], chars: int = SUMMARY_CHARS) -> str:
+    question = _text(turn[0]).strip()
+    answers = [_text(content) for content in turn if content.role == "model"]
+    answer = " ".join((answers[-1] if answers else "no answer").split())
+    if len(answer) > chars:
+        answer = answer[:chars].rsplit(" ", 1)[0] + "..."
+    return f'- Asked "{question}", answered: {answer}'
+
+
+class HistoryCompactor:
+    """
+    Keeps an LLM agent's prompt within its token budget as a session grows.
+
+    The current turn and the last `keep_turns` turns are sent as they are,
+    older turns as one summary line each. Past the budget, the oldest
+    summaries are dropped first, then earlier turns summarized, and last
+    the longest inputs of the current turn shortened.
+
+    Use `before_model` and `after_model` as the agent's callbacks; the
+    latter records prompt tokens and latency of each turn.
+    """
+
+    def __init__(
+        self,
+        budget: int | None = None,
+        keep_turns: int = KEEP_TURNS,
+        summary_chars: int = SUMMARY_CHARS,
+    ):
+        self.budget = budget
+        self.keep_turns = keep_turns
+        self.summary_chars = summary_chars
+        self.turns = deque(maxlen=100)
+        self._pending: dict[str, tuple[float, dict]] = {}
+
+    def compact(
+        self,
+        contents: list[types.Content],
+        questions: list[types.Content],
+        budget: int,
+        system: str = "",
+    ) -> tuple[list[types.Content], dict]:
+        *earlier, current = split_turns(contents, questions) or [[]]
+        kept = earlier[-self.keep_turns :] if self.keep_turns else []
+        summaries = [
+            summarize(turn, self.summary_chars)
+            for turn in earlier[: len(earlier) - len(kept)]
+        ]
+        report = {
+            "turns": len(earlier) + 1,
+            "summarized": len(summaries),
+            "dropped": 0,
+            "shortened": 0,
+        }
+
+        def build() -> list[types.Content]:
+            header = []
+            if summaries:
+                text = "Summary of earlier turns:\n" + "\n".join(summaries)
+                header = [types.Content(role="user", parts=[types.Part(text=text)])]
+            return header + [c for turn in kept for c in turn] + current
+
+        compacted = build()
+        while estimate_tokens(compacted, system) > budget:
+            if summaries:
+                summaries.pop(0)
+                report["dropped"] += 1
+            elif kept:
+                summaries.append(summarize(kept.pop(0), self.summary_chars))
+                report["summarized"] += 1
+            else:
+                # Only the current turn is left, shorten its longest input
+                parts = [
+                    part
+                    for content in current[1:]
+                    for part in content.parts or []
+                    if part.text and len(part.text) > MIN_PART_CHARS + len(SHORTENED)
+                ]
+                if not parts:
+                    break
+                part = max(parts, key=lambda part: len(part.text))
+                text = part.text.removesuffix(SHORTENED)
+                excess = estimate_tokens(compacted, system) - budget
+                keep = max(
+                    len(text) - excess * CHARS_PER_TOKEN - len(SHORTENED),
+                    MIN_PART_CHARS,
+                )
+                part.text = text[:keep] + SHORTENED
+                report["shortened"] += 1
+            compacted = build()
+        return compacted, report
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        agent_name = callback_context.agent_name
+        budget = self.budget or AGENT_TOKEN_BUDGETS.get(
+            agent_name, DEFAULT_TOKEN_BUDGET
+        )
+        session = callback_context._invocation_context.session
+        questions = [e.content for e in session.events if e.author == "user"]
+        system = llm_request.config.system_instruction if llm_request.config else ""
+        system = system if isinstance(system, str) else ""
+
+        before = estimate_tokens(llm_request.contents, system)
+        llm_request.contents, report = self.compact(
+            llm_request.contents, questions, budget, system
+        )
+        report.update(
+            agent=agent_name,
+            budget=budget,
+            estimated_tokens_before=before,
+            estimated_tokens=estimate_tokens(llm_request.contents, system),
+        )
+        self._pending[callback_context.invocation_id] = (time.perf_counter(), report)
+        return None
+
+    def after_model(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> LlmResponse | None:
+        if llm_response.partial:
+            return None
+        started, report = self._pending.pop(
+            callback_context.invocation_id, (None, None)
+        )
+        if report is None:
+            return None
+        usage = llm_response.usage_metadata
+        report["prompt_tokens"] = usage.prompt_token_count if usage else None
+        report["latency"] = round(time.perf_counter() - started, 3)
+        self.turns.append(report)
+        logger.info(
+            f"{report['agent']}: turn {report['turns']}, "
+            f"~{report['estimated_tokens_before']} -> "
+            f"~{report['estimated_tokens']} tokens, "
+            f"{report['prompt_tokens']} prompt tokens, {report['latency']}s"
+        )
+        return None
+
+    def stats(self) -> list[dict]:
+        return list(self.turns)
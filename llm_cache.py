@@ -0,0 +1,157 @@
+from litellm.caching.base_cache import BaseCache
+from litellm.caching.caching import Cache
+from pathlib import Path
+import threading
+import logging
+import sqlite3
+import litellm
+import json
+import time
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Off by default: with it on, an identical request gets the first answer back
+LLM_CACHE = os.getenv("LLM_CACHE", "0") == "1"
+# One file for every process on the machine, so all agents share answers
+LLM_CACHE_DB = os.getenv(
+    "LLM_CACHE_DB",
+    str(Path.home() / ".cache" / "agentic_shopper" / "llm_cache.sqlite3"),
+)
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "256"))
+LLM_CACHE_BUSY_TIMEOUT = 30.0
+
+_cache = None
+
+
+class SQLiteCompletionCache(BaseCache):
+    """
+    Completions of litellm calls, kept on local disk.
+
+    Keys are litellm's hash of the model, its parameters and the messages,
+    so ADK's LiteLlm and crewai's LLM share entries. Past `max_bytes` the
+    least recently used entries are evicted. Several processes can use
+    the same file.
+    """
+
+    def __init__(
+        self,
+        db_path: str = LLM_CACHE_DB,
+        max_bytes: int = int(LLM_CACHE_MAX_MB * 2**20),
+    ):
+        super().__init__()
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, timeout=LLM_CACHE_BUSY_TIMEOUT, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, size INTEGER NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS completions_used_at ON completions (used_at)"
+        )
+        self._conn.commit()
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def get_cache(self, key, **kwargs):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE completions SET used_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                self._conn.commit()
+        if row is None:
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return json.loads(row[0])
+
+    def set_cache(self, key, value, **kwargs):
+        value = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, size, used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+        self.counters["writes"] += 1
+
+    def _evict(self):
+        # Down to 90% of the limit, so not every write has to evict
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM completions"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM completions ORDER BY used_at"
+        ):
+            if excess <= 0:
+                break
+            victims.append((key,))
+            excess -= size
+        self._conn.executemany("DELETE FROM completions WHERE key = ?", victims)
+        self.counters["evictions"] += len(victims)
+
+    async def async_get_cache(self, key, **kwargs):
+        return self.get_cache(key, **kwargs)
+
+    async def async_set_cache(self, key, value, **kwargs):
+        self.set_cache(key, value, **kwargs)
+
+    async def async_set_cache_pipeline(self, cache_list, **kwargs):
+        for key, value in cache_list:
+            self.set_cache(key, value, **kwargs)
+
+    def flush_cache(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+
+    async def disconnect(self):
+        self._conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+            ).fetchone()
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def install_completion_cache() -> SQLiteCompletionCache | None:
+    """Puts every litellm completion of this process behind the disk cache."""
+    global _cache
+    if not LLM_CACHE:
+        return None
+    if _cache is None:
+        _cache = SQLiteCompletionCache()
+        litellm.cache = Cache(supported_call_types=["completion", "acompletion"])
+        litellm.cache.cache = _cache
+        logger.info(f"LLM completion cache at {_cache.db_path}")
+    return _cache
+
+
+def completion_cache_stats() -> dict:
+    return _cache.stats() if _cache is not None else {"enabled": False}
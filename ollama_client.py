@@ -0,0 +1,102 @@
+from litellm.llms.custom_httpx.http_handler import AsyncHTTPHandler, HTTPHandler
+import threading
+import logging
+import httpx
+import time
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1-cpu-custom")
+LLM_MODEL = f"ollama_chat/{OLLAMA_MODEL}"
+# How long Ollama keeps the model loaded after each request, -1 for ever
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+# Load the model when the service starts rather than on the first request
+OLLAMA_WARM_UP = os.getenv("OLLAMA_WARM_UP", "1") == "1"
+# Connections to Ollama shared by every LLM call of the process
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "16"))
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "600"))
+
+_clients: dict[str, AsyncHTTPHandler | HTTPHandler] = {}
+_lock = threading.Lock()
+_warm_up = {"state": "not started", "seconds": None, "error": None}
+
+
+def keep_alive() -> int | str:
+    # Ollama reads a bare number as seconds and a string as a duration
+    value = OLLAMA_KEEP_ALIVE.strip()
+    return int(value) if value.lstrip("-").isdigit() else value
+
+
+def async_client() -> AsyncHTTPHandler:
+    with _lock:
+        if "async" not in _clients:
+            _clients["async"] = AsyncHTTPHandler(
+                timeout=OLLAMA_TIMEOUT, concurrent_limit=OLLAMA_MAX_CONNECTIONS
+            )
+        return _clients["async"]
+
+
+def sync_client() -> HTTPHandler:
+    with _lock:
+        if "sync" not in _clients:
+            _clients["sync"] = HTTPHandler(
+                timeout=OLLAMA_TIMEOUT, concurrent_limit=OLLAMA_MAX_CONNECTIONS
+            )
+        return _clients["sync"]
+
+
+def llm_options(sync: bool = False) -> dict:
+    """
+    Arguments for ADK's LiteLlm, or for crewai's LLM with `sync`, so every
+    call uses the shared connections and renews the model's keep-alive.
+    """
+    return {
+        "base_url": OLLAMA_URL,
+        "keep_alive": keep_alive(),
+        "client": sync_client() if sync else async_client(),
+    }
+
+
+def warm_up() -> bool:
+    """Loads the model into Ollama's memory, an empty prompt generates nothing."""
+    _warm_up.update(state="warming", error=None)
+    start = time.perf_counter()
+    try:
+        response = sync_client().client.post(
+            f"{OLLAMA_URL}/api/generate",
+            json={"model": OLLAMA_MODEL, "keep_alive": keep_alive()},
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        _warm_up.update(state="failed", error=str(e))
+        logger.warning(f"Warming up {OLLAMA_MODEL} failed: {e}")
+        return False
+    _warm_up.update(state="done", seconds=round(time.perf_counter() - start, 2))
+    logger.info(f"{OLLAMA_MODEL} loaded in {_warm_up['seconds']}s")
+    return True
+
+
+def start_warm_up() -> threading.Thread | None:
+    # In the background, the service can take requests while the model loads
+    if not OLLAMA_WARM_UP:
+        return None
+    thread = threading.Thread(target=warm_up, name="ollama-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+async def readiness() -> dict:
+    """Whether the model is loaded in Ollama right now, by us or anyone else."""
+    status = {"ready": False, "model": OLLAMA_MODEL, "warm_up": dict(_warm_up)}
+    try:
+        response = await async_client().client.get(f"{OLLAMA_URL}/api/ps")
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        return {**status, "error": str(e)}
+    for loaded in response.json().get("models") or []:
+        if loaded.get("name") in (OLLAMA_MODEL, f"{OLLAMA_MODEL}:latest"):
+            return {**status, "ready": True, "expires_at": loaded.get("expires_at")}
+    return status
@@ -0,0 +1,123 @@
+"""
+A stand-in for the Ollama server, for the benchmarks on machines without
+the model. It serves the endpoints the shopper uses: /api/chat, streamed
+or not, /api/generate to load and unload a model, and /api/ps.
+
+Loading a model takes `--load` seconds, unless it is still loaded from an
+earlier request and its keep-alive hasn't run out. Every answer takes
+`--answer` seconds after that.
+
+    python ollama_stand_in.py --port 11435 --load 4 --answer 1
+    python bench_warm_up.py --base-url http://localhost:11435
+    python bench_llm_cache.py --base-url http://localhost:11435
+"""
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+import asyncio
+import uvicorn
+import click
+import json
+import time
+
+# Ollama's default when a request has no keep_alive
+DEFAULT_KEEP_ALIVE = 300.0
+UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def keep_alive_seconds(value) -> float:
+    if value is None:
+        return DEFAULT_KEEP_ALIVE
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    elif value[-1:] in UNITS:
+        seconds = float(value[:-1]) * UNITS[value[-1]]
+    else:
+        seconds = float(value)
+    # Negative keeps the model loaded for ever, a year is as good here
+    return 365 * 86400.0 if seconds < 0 else seconds
+
+
+def timestamp(seconds: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+def tagged(model: str) -> str:
+    # /api/ps names models with their tag
+    return model if ":" in model else f"{model}:latest"
+
+
+def create_app(load: float, answer: float) -> Starlette:
+    loaded_until: dict[str, float] = {}
+    lock = asyncio.Lock()
+    calls = 0
+
+    async def load_model(model: str, keep_alive) -> None:
+        async with lock:
+            if loaded_until.get(model, 0.0) < time.time():
+                await asyncio.sleep(load)
+            loaded_until[model] = time.time() + keep_alive_seconds(keep_alive)
+
+    async def generate(request: Request) -> JSONResponse:
+        body = await request.json()
+        if body.get("keep_alive") == 0:
+            loaded_until.pop(body["model"], None)
+            return JSONResponse({"model": body["model"], "done_reason": "unload"})
+        await load_model(body["model"], body.get("keep_alive"))
+        return JSONResponse({"model": body["model"], "response": "", "done": True})
+
+    async def chat(request: Request) -> JSONResponse | StreamingResponse:
+        nonlocal calls
+        body = await request.json()
+        await load_model(body["model"], body.get("keep_alive"))
+        await asyncio.sleep(answer)
+        calls += 1
+        message = {
+            "model": body["model"],
+            "created_at": timestamp(time.time()),
+            "message": {"role": "assistant", "content": f"Stand-in answer {calls}."},
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": 10,
+            "eval_count": 5,
+        }
+        if not body.get("stream", True):
+            return JSONResponse(message)
+
+        async def chunks():
+            yield json.dumps({**message, "done": False}) + "\n"
+            empty = {"role": "assistant", "content": ""}
+            yield json.dumps({**message, "message": empty}) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    async def ps(request: Request) -> JSONResponse:
+        now = time.time()
+        models = [
+            {"name": tagged(model), "expires_at": timestamp(until)}
+            for model, until in loaded_until.items()
+            if until > now
+        ]
+        return JSONResponse({"models": models})
+
+    return Starlette(
+        routes=[
+            Route("/api/chat", chat, methods=["POST"]),
+            Route("/api/generate", generate, methods=["POST"]),
+            Route("/api/ps", ps),
+        ]
+    )
+
+
+@click.command()
+@click.option("--port", "port", default=11435)
+@click.option("--load", "load", default=4.0)
+@click.option("--answer", "answer", default=1.0)
+def main(port, load, answer):
+    uvicorn.run(create_app(load, answer), port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
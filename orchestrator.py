@@ -1,42 +1,72 @@
 from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
 from google.adk.models.lite_llm import LiteLlm
-from google.adk.agents import Agent, SequentialAgent, ParallelAgent
+from google.adk.agents import Agent, SequentialAgent
+from pipeline import PIPELINE_TIMEOUT, PipelinedShopper
+from deadlines import AGENT_DEADLINES, DeadlineParallelAgent
+from replicas import ReplicaRouter, replica_urls
+from history import HistoryCompactor
+from llm_cache import install_completion_cache
+from ollama_client import LLM_MODEL, llm_options
+import os
 
-model = LiteLlm(
-    model="ollama_chat/llama3.1-cpu-custom",
-    base_url="http://localhost:11434",
+# "sequential" runs each stage after the previous one, "pipelined" starts
+# price and review lookups while the recommender is still answering
+WORKFLOW_MODE = os.getenv("ORCHESTRATOR_WORKFLOW", "sequential")
+
+# Opt-in disk cache of completions, see LLM_CACHE
+install_completion_cache()
+# Every call goes over the process's shared connections to Ollama
+model = LiteLlm(model=LLM_MODEL, **llm_options())
+
+# Remote Agents, each can run as several replicas listed comma separated
+router = ReplicaRouter(
+    {
+        "price_tracker_agent": replica_urls(
+            "PRICE_TRACKER_REPLICAS", "http://localhost:10001"
+        ),
+        "review_analysis_agent": replica_urls(
+            "REVIEW_ANALYSIS_REPLICAS", "http://localhost:10002"
+        ),
+        "product_recommender_agent": replica_urls(
+            "RECOMMENDER_REPLICAS", "http://localhost:10003"
+        ),
+    }
 )
 
-# Remote Agents
-price_tracker_agent_card_url = "http://localhost:10001/.well-known/agent-card.json"
+price_tracker_agent_card_url = router.card_url("price_tracker_agent")
 price_tracker_agent = RemoteA2aAgent(
     name="price_tracker_agent",
     description="Fetch the price details of products",
     agent_card=price_tracker_agent_card_url,
+    httpx_client=router.client(AGENT_DEADLINES["price_tracker_agent"]),
 )
 
-review_analysis_agentt_card_url = "http://localhost:10002/.well-known/agent-card.json"
+review_analysis_agentt_card_url = router.card_url("review_analysis_agent")
 review_analysis_agent = RemoteA2aAgent(
     name="review_analysis_agent",
     description="Fetches customer reviews for the products",
     agent_card=review_analysis_agentt_card_url,
+    httpx_client=router.client(AGENT_DEADLINES["review_analysis_agent"]),
 )
 
-product_recommender_agent_card_url = (
-    "http://localhost:10003/.well-known/agent-card.json"
-)
+product_recommender_agent_card_url = router.card_url("product_recommender_agent")
 product_recommender_agent = RemoteA2aAgent(
     name="product_recommender_agent",
     description="Suggest products based on the user specifications",
     agent_card=product_recommender_agent_card_url,
+    httpx_client=router.client(AGENT_DEADLINES["product_recommender_agent"]),
 )
 
-priceTracker_reviewAnalysis_agents = ParallelAgent(
+# Goes ahead without an agent that misses its deadline or the latency budget
+priceTracker_reviewAnalysis_agents = DeadlineParallelAgent(
     name="priceTracker_reviewAnalysis_agents",
     sub_agents=[price_tracker_agent, review_analysis_agent],
     description="Runs agents in parallel",
 )
 
+# Older turns are summarized, so the prompt stays within the shopper's budget
+shopper_history = HistoryCompactor()
+
 e_commerce_personal_shopper = Agent(
     name="E_Commerce_Personal_Shopper",
     model=model,
@@ -44,16 +74,31 @@ e_commerce_personal_shopper = Agent(
     instruction="""
     Based on the inputs, provide which is better.
     Also share the link to purchase ONLY from the input obtained.
+    Inputs marked "results missing" did not arrive in time, say that part
+    is unavailable instead of guessing it.
     """,
     output_key="personal_shopper",
+    before_model_callback=shopper_history.before_model,
+    after_model_callback=shopper_history.after_model,
 )
 
-personal_shopper = SequentialAgent(
-    name="Personal_Shopper",
-    description="Sequentially calls subagents",
-    sub_agents=[
-        product_recommender_agent,
-        priceTracker_reviewAnalysis_agents,
-        e_commerce_personal_shopper,
-    ],
-)
+if WORKFLOW_MODE == "pipelined":
+    personal_shopper = PipelinedShopper(
+        name="Personal_Shopper",
+        description="Pipelines the remote agents into the shopper",
+        recommender_card_url=product_recommender_agent_card_url,
+        price_tracker_card_url=price_tracker_agent_card_url,
+        review_analysis_card_url=review_analysis_agentt_card_url,
+        http_client=router.client(PIPELINE_TIMEOUT),
+        sub_agents=[e_commerce_personal_shopper],
+    )
+else:
+    personal_shopper = SequentialAgent(
+        name="Personal_Shopper",
+        description="Sequentially calls subagents",
+        sub_agents=[
+            product_recommender_agent,
+            priceTracker_reviewAnalysis_agents,
+            e_commerce_personal_shopper,
+        ],
+    )
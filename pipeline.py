@@ -0,0 +1,346 @@
+from a2a.client import A2ACardResolver, Client, ClientConfig, ClientFactory
+from a2a.types import (
+    DataPart,
+    Message,
+    Part,
+    Role,
+    TaskState,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+from deadlines import (
+    AGENT_DEADLINES,
+    DEFAULT_DEADLINE,
+    LATENCY_BUDGET,
+    SHOPPER_RESERVE,
+    is_missing,
+    missing_result,
+    remaining_budget,
+)
+from dataclasses import dataclass
+from pydantic import Field, PrivateAttr
+from typing import AsyncGenerator
+from urllib.parse import urlsplit
+import logging
+import asyncio
+import httpx
+import time
+import uuid
+import json
+import os
+import re
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Products announced below this confidence wait for the final answer
+SPECULATE_MIN_CONFIDENCE = float(
+    os.getenv("PIPELINE_SPECULATE_MIN_CONFIDENCE", "0.7")
+)
+PIPELINE_TIMEOUT = float(os.getenv("PIPELINE_TIMEOUT", "600"))
+# Lookup requests in flight to each remote agent, for all users together.
+# Kept under the price tracker's admission limit (2 crews + 8 queued) so
+# speculative lookups aren't turned away as busy
+PIPELINE_MAX_LOOKUPS = int(os.getenv("PIPELINE_MAX_LOOKUPS", "4"))
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def product_key(name: str) -> str:
+    return " ".join(_WORD.findall(name.lower()))
+
+
+def _text_of(parts: list[Part]) -> str:
+    return "".join(p.root.text for p in parts if isinstance(p.root, TextPart))
+
+
+def _products_of(parts: list[Part]) -> tuple[list[str], float] | None:
+    for part in parts:
+        if isinstance(part.root, DataPart) and "products" in part.root.data:
+            data = part.root.data
+            names = [p["name"] for p in data["products"] if p.get("name")]
+            return names, float(data.get("confidence", 1.0))
+    return None
+
+
+@dataclass
+class _Batch:
+    # Products of one lookup, more join it until it gets its request slots
+    names: list[str]
+    sent: bool = False
+
+
+def _labelled(names: list[str], text: str) -> str:
+    # An answer about several products already names each of them
+    if len(names) == 1 or is_missing(text):
+        return f"**{', '.join(names)}**\n{text}"
+    return text
+
+
+class PipelinedShopper(BaseAgent):
+    """
+    Recommender, price/review lookups and the shopper run as a pipeline.
+
+    The recommender is streamed and the products it names start their price
+    and review lookups straight away, instead of after the full answer.
+    At most `max_lookups` requests per agent are in flight for all users,
+    products named while a lookup waits for a slot join its request. When
+    the answer is final, lookups for products it dropped are cancelled and
+    products it added late are started, then the shopper sub-agent runs on
+    the collected results. End to end latency tends to max(stage) rather
+    than the sum of the stages.
+
+    Every remote call has its deadline and the lookups stop at the turn's
+    latency budget, results that miss it are marked missing for the shopper.
+    """
+
+    recommender_card_url: str
+    price_tracker_card_url: str
+    review_analysis_card_url: str
+    timeout: float = PIPELINE_TIMEOUT
+    # Shared client, for instance one routing between agent replicas
+    http_client: httpx.AsyncClient | None = None
+    deadlines: dict[str, float] = Field(
+        default_factory=lambda: dict(AGENT_DEADLINES)
+    )
+    budget: float = LATENCY_BUDGET
+    reserve: float = SHOPPER_RESERVE
+    max_lookups: int = PIPELINE_MAX_LOOKUPS
+
+    _http: httpx.AsyncClient | None = PrivateAttr(default=None)
+    _clients: dict = PrivateAttr(default_factory=dict)
+    _limits: dict[str, asyncio.Semaphore] = PrivateAttr(default_factory=dict)
+
+    async def _client(self, card_url: str, streaming: bool) -> Client:
+        key = (card_url, streaming)
+        if key not in self._clients:
+            if self._http is None:
+                self._http = self.http_client or httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.timeout)
+                )
+            url = urlsplit(card_url)
+            card = await A2ACardResolver(
+                self._http,
+                base_url=f"{url.scheme}://{url.netloc}",
+                agent_card_path=url.path,
+            ).get_agent_card()
+            config = ClientConfig(streaming=streaming, httpx_client=self._http)
+            self._clients[key] = ClientFactory(config).create(card)
+        return self._clients[key]
+
+    @staticmethod
+    def _message(text: str, context_id: str | None = None) -> Message:
+        return Message(
+            role=Role.user,
+            message_id=uuid.uuid4().hex,
+            parts=[Part(root=TextPart(text=text))],
+            context_id=context_id,
+        )
+
+    async def _ask(self, card_url: str, text: str) -> str:
+        client = await self._client(card_url, streaming=False)
+        result = ""
+        async for event in client.send_message(self._message(text)):
+            if isinstance(event, Message):
+                return _text_of(event.parts)
+            task, _ = event
+            if task.status.state == TaskState.failed:
+                message = task.status.message
+                raise RuntimeError(_text_of(message.parts) if message else "failed")
+            result = "".join(_text_of(a.parts) for a in task.artifacts or [])
+        return result
+
+    async def _ask_within(self, agent: str, card_url: str, text: str) -> str:
+        deadline = self.deadlines.get(agent, DEFAULT_DEADLINE)
+        try:
+            return await asyncio.wait_for(self._ask(card_url, text), deadline)
+        except asyncio.TimeoutError:
+            return missing_result(agent, f"no answer within {round(deadline, 1):g}s")
+        except Exception as e:
+            return missing_result(agent, f"failed ({e})")
+
+    def _slot(self, agent: str) -> asyncio.Semaphore:
+        if agent not in self._limits:
+            self._limits[agent] = asyncio.Semaphore(self.max_lookups)
+        return self._limits[agent]
+
+    async def _lookup(self, batch: _Batch) -> tuple[str, str]:
+        # Both slots first, always in this order, so both agents get the same
+        # products. Waiting counts against the turn's budget, not a deadline
+        async with (
+            self._slot("price_tracker_agent"),
+            self._slot("review_analysis_agent"),
+        ):
+            batch.sent = True
+            names = list(batch.names)
+            # The structured form lets the remote agents skip their extraction
+            products = json.dumps({"products": [{"name": n} for n in names]})
+            listed = ", ".join(names)
+            return await asyncio.gather(
+                self._ask_within(
+                    "price_tracker_agent",
+                    self.price_tracker_card_url,
+                    f"Prices of {listed}.\n{products}",
+                ),
+                self._ask_within(
+                    "review_analysis_agent",
+                    self.review_analysis_card_url,
+                    f"Reviews of {listed}.\n{products}",
+                ),
+            )
+
+    async def _recommend(
+        self, query: str, context_id: str, speculate
+    ) -> tuple[str, list[str]]:
+        client = await self._client(self.recommender_card_url, streaming=True)
+        names: list[str] = []
+        async for event in client.send_message(self._message(query, context_id)):
+            if isinstance(event, Message):
+                return _text_of(event.parts), names
+
+            task, update = event
+            if isinstance(update, TaskStatusUpdateEvent) and update.status.message:
+                announced = _products_of(update.status.message.parts)
+                if announced and announced[1] >= SPECULATE_MIN_CONFIDENCE:
+                    names = announced[0]
+                    speculate(names)
+
+            if task.status.state == TaskState.failed:
+                message = task.status.message
+                raise RuntimeError(_text_of(message.parts) if message else "failed")
+            if task.status.state == TaskState.completed:
+                parts = [p for a in task.artifacts or [] for p in a.parts]
+                final = _products_of(parts)
+                return _text_of(parts), final[0] if final else names
+
+        return "", names
+
+    def _event(self, ctx: InvocationContext, author: str, text: str) -> Event:
+        return Event(
+            author=author,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        parts = ctx.user_content.parts if ctx.user_content else []
+        query = "\n".join(p.text for p in parts if p.text)
+        start = time.perf_counter()
+        # Product key to its lookup, and each lookup to the products it asks for
+        lookups: dict[str, asyncio.Task] = {}
+        batches: dict[asyncio.Task, _Batch] = {}
+        announced: list[str] = []
+
+        def speculate(names: list[str]):
+            announced[:] = names
+            for name in names:
+                key = product_key(name)
+                if not key or key in lookups:
+                    continue
+                lookup = next((t for t, b in batches.items() if not b.sent), None)
+                if lookup is None:
+                    batch = _Batch(names=[])
+                    lookup = asyncio.create_task(self._lookup(batch))
+                    batches[lookup] = batch
+                logger.info(f"Starting lookups for '{name}' ahead of the answer")
+                batches[lookup].names.append(name)
+                lookups[key] = lookup
+
+        try:
+            deadline = min(
+                self.deadlines.get("product_recommender_agent", DEFAULT_DEADLINE),
+                remaining_budget(ctx, self.budget, self.reserve),
+            )
+            try:
+                text, names = await asyncio.wait_for(
+                    self._recommend(query, ctx.session.id, speculate), deadline
+                )
+            except Exception as e:
+                reason = (
+                    f"no final answer within {round(deadline, 1):g}s"
+                    if isinstance(e, asyncio.TimeoutError)
+                    else f"failed ({e})"
+                )
+                logger.error(f"Recommender {reason}")
+                if not announced:
+                    yield Event(
+                        author="product_recommender_agent",
+                        invocation_id=ctx.invocation_id,
+                        branch=ctx.branch,
+                        error_message=f"Recommender {reason}",
+                    )
+                    return
+                # Carry on with the products it named before giving up
+                text = missing_result("product_recommender_agent", reason)
+                names = list(announced)
+
+            recommended = time.perf_counter()
+            yield self._event(ctx, "product_recommender_agent", text)
+
+            # Products the final answer dropped are not worth waiting for
+            final = {product_key(name): name for name in names}
+            dropped = [key for key in lookups if key not in final]
+            for key in dropped:
+                lookups.pop(key)
+            wanted = set(lookups.values())
+            for lookup, batch in list(batches.items()):
+                if lookup not in wanted:
+                    batches.pop(lookup).cancel()
+                elif not batch.sent:
+                    # Not asked yet, the request leaves the dropped ones out
+                    batch.names[:] = [n for n in batch.names if product_key(n) in final]
+            started_early = len(lookups)
+            speculate(list(final.values()))
+
+            # Past the budget the shopper answers with whatever has arrived
+            pending = list(dict.fromkeys(lookups[key] for key in final))
+            if pending:
+                await asyncio.wait(
+                    pending, timeout=remaining_budget(ctx, self.budget, self.reserve)
+                )
+            late = tuple(
+                missing_result(agent, "latency budget exhausted")
+                for agent in ("price_tracker_agent", "review_analysis_agent")
+            )
+            results = [
+                lookup.result() if lookup.done() else late for lookup in pending
+            ]
+            logger.info(
+                f"Pipeline: recommender {recommended - start:.2f}s, "
+                f"lookups done {time.perf_counter() - start:.2f}s, "
+                f"{started_early}/{len(final)} started early, "
+                f"{len(dropped)} cancelled"
+            )
+
+            if final:
+                names = [batches[lookup].names for lookup in pending]
+                yield self._event(
+                    ctx,
+                    "price_tracker_agent",
+                    "\n\n".join(
+                        _labelled(batch, price)
+                        for batch, (price, _) in zip(names, results)
+                    ),
+                )
+                yield self._event(
+                    ctx,
+                    "review_analysis_agent",
+                    "\n\n".join(
+                        _labelled(batch, review)
+                        for batch, (_, review) in zip(names, results)
+                    ),
+                )
+        finally:
+            for lookup in batches:
+                lookup.cancel()
+
+        for sub_agent in self.sub_agents:
+            async for event in sub_agent.run_async(ctx):
+                yield event
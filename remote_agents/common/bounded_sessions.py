@@ -0,0 +1,270 @@
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
+from google.adk.sessions import (
+    DatabaseSessionService,
+    InMemorySessionService,
+    Session,
+)
+from google.adk.sessions.database_session_service import (
+    StorageEvent,
+    StorageSession,
+)
+from remote_agents.common.stores import (
+    MAX_ARTIFACTS,
+    MAX_SESSION_EVENTS,
+    MAX_SESSIONS,
+    PRUNE_EVERY,
+    SESSION_TTL,
+)
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, delete, exists, func, select, update
+from collections import OrderedDict
+from pydantic import Field
+import time
+
+
+def _trim(session: Session, max_events: int) -> float | None:
+    # Oldest events go first, returns the timestamp of the first one kept
+    if len(session.events) <= max_events:
+        return None
+    del session.events[:-max_events]
+    return session.events[0].timestamp
+
+
+class BoundedSessionService(InMemorySessionService):
+    """
+    In-memory sessions, at most `max_sessions` of them, each dropped after
+    `ttl` seconds without use and keeping its last `max_events` events.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_SESSIONS,
+        ttl: float = SESSION_TTL,
+        max_events: int = MAX_SESSION_EVENTS,
+    ):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_events = max_events
+        self._used: OrderedDict[tuple[str, str, str], float] = OrderedDict()
+        self.counters = {"evictions": 0, "trimmed_events": 0}
+
+    def _touch(self, app_name: str, user_id: str, session_id: str):
+        key = (app_name, user_id, session_id)
+        self._used.pop(key, None)
+        self._used[key] = time.time()
+        self._evict()
+
+    def _evict(self):
+        now = time.time()
+        while self._used:
+            key, used = next(iter(self._used.items()))
+            if len(self._used) <= self.max_sessions and now - used < self.ttl:
+                break
+            del self._used[key]
+            app_name, user_id, session_id = key
+            user_sessions = self.sessions.get(app_name, {}).get(user_id, {})
+            if user_sessions.pop(session_id, None) is not None:
+                self.counters["evictions"] += 1
+            if not user_sessions:
+                self.sessions.get(app_name, {}).pop(user_id, None)
+
+    async def create_session(self, **kwargs) -> Session:
+        session = await super().create_session(**kwargs)
+        self._touch(session.app_name, session.user_id, session.id)
+        return session
+
+    async def get_session(self, **kwargs) -> Session | None:
+        session = await super().get_session(**kwargs)
+        if session is not None:
+            self._touch(session.app_name, session.user_id, session.id)
+        return session
+
+    async def delete_session(self, **kwargs) -> None:
+        await super().delete_session(**kwargs)
+        key = (kwargs["app_name"], kwargs["user_id"], kwargs["session_id"])
+        self._used.pop(key, None)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        _trim(session, self.max_events)
+        stored = (
+            self.sessions.get(session.app_name, {})
+            .get(session.user_id, {})
+            .get(session.id)
+        )
+        if stored is not None and _trim(stored, self.max_events) is not None:
+            self.counters["trimmed_events"] += 1
+        self._touch(session.app_name, session.user_id, session.id)
+        return event
+
+    def stats(self) -> dict:
+        sessions = [
+            session
+            for users in self.sessions.values()
+            for user_sessions in users.values()
+            for session in user_sessions.values()
+        ]
+        return {
+            **self.counters,
+            "entries": len(sessions),
+            "events": sum(len(session.events) for session in sessions),
+        }
+
+
+class BoundedDatabaseSessionService(DatabaseSessionService):
+    """
+    Sessions in a database shared by the workers, pruned like
+    BoundedSessionService every `PRUNE_EVERY` writes.
+
+    SQLite only cascades deletes with foreign keys switched on per
+    connection, so events of deleted sessions are removed here as well.
+    """
+
+    def __init__(
+        self,
+        db_url: str,
+        max_sessions: int = MAX_SESSIONS,
+        ttl: float = SESSION_TTL,
+        max_events: int = MAX_SESSION_EVENTS,
+        **kwargs,
+    ):
+        super().__init__(db_url, **kwargs)
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_events = max_events
+        self._writes = 0
+        self.counters = {"evictions": 0, "trimmed_events": 0}
+
+    def _written(self):
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        # SQLite keeps update times as naive UTC
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=self.ttl
+        )
+        overflow = (
+            select(StorageSession.app_name, StorageSession.user_id, StorageSession.id)
+            .order_by(StorageSession.update_time.desc())
+            .offset(self.max_sessions)
+        )
+        with self.database_session_factory() as sql_session:
+            evicted = sql_session.execute(
+                delete(StorageSession).where(StorageSession.update_time < cutoff)
+            ).rowcount
+            for app_name, user_id, session_id in sql_session.execute(overflow).all():
+                evicted += sql_session.execute(
+                    delete(StorageSession).where(
+                        StorageSession.app_name == app_name,
+                        StorageSession.user_id == user_id,
+                        StorageSession.id == session_id,
+                    )
+                ).rowcount
+            sql_session.execute(
+                delete(StorageEvent).where(
+                    ~exists().where(
+                        and_(
+                            StorageSession.app_name == StorageEvent.app_name,
+                            StorageSession.user_id == StorageEvent.user_id,
+                            StorageSession.id == StorageEvent.session_id,
+                        )
+                    )
+                )
+            )
+            sql_session.commit()
+        self.counters["evictions"] += evicted
+
+    async def create_session(self, **kwargs) -> Session:
+        # Pruned first, a new session is never the one evicted
+        self._written()
+        return await super().create_session(**kwargs)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        oldest_kept = _trim(session, self.max_events)
+        # Events leave the session row alone, its update time marks last use
+        used = datetime.fromtimestamp(event.timestamp, timezone.utc)
+        key = (
+            StorageSession.app_name == session.app_name,
+            StorageSession.user_id == session.user_id,
+            StorageSession.id == session.id,
+        )
+        with self.database_session_factory() as sql_session:
+            sql_session.execute(
+                update(StorageSession)
+                .where(*key)
+                .values(update_time=used.replace(tzinfo=None))
+            )
+            if oldest_kept is not None:
+                sql_session.execute(
+                    delete(StorageEvent).where(
+                        StorageEvent.app_name == session.app_name,
+                        StorageEvent.user_id == session.user_id,
+                        StorageEvent.session_id == session.id,
+                        StorageEvent.timestamp < datetime.fromtimestamp(oldest_kept),
+                    )
+                )
+                self.counters["trimmed_events"] += 1
+            sql_session.commit()
+        session.last_update_time = used.timestamp()
+        self._written()
+        return event
+
+    def stats(self) -> dict:
+        with self.database_session_factory() as sql_session:
+            sessions = sql_session.scalar(
+                select(func.count()).select_from(StorageSession)
+            )
+            events = sql_session.scalar(select(func.count()).select_from(StorageEvent))
+        return {**self.counters, "entries": sessions, "events": events}
+
+
+class BoundedArtifactService(InMemoryArtifactService):
+    """In-memory artifacts, the least recently used dropped past `max_entries`."""
+
+    max_entries: int = MAX_ARTIFACTS
+    evictions: int = Field(default=0)
+
+    async def save_artifact(self, **kwargs) -> int:
+        version = await super().save_artifact(**kwargs)
+        # Dicts keep insertion order, the first artifact is the oldest
+        while len(self.artifacts) > self.max_entries:
+            del self.artifacts[next(iter(self.artifacts))]
+            self.evictions += 1
+        return version
+
+    async def load_artifact(
+        self, *, app_name: str, user_id: str, session_id: str, filename: str, **kwargs
+    ):
+        artifact = await super().load_artifact(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            filename=filename,
+            **kwargs,
+        )
+        if artifact is not None:
+            path = self._artifact_path(app_name, user_id, session_id, filename)
+            self.artifacts[path] = self.artifacts.pop(path)
+        return artifact
+
+    def stats(self) -> dict:
+        versions = [part for parts in self.artifacts.values() for part in parts]
+        size = sum(
+            len(part.inline_data.data or b"")
+            if part.inline_data
+            else len(part.text or "")
+            for part in versions
+        )
+        return {
+            "evictions": self.evictions,
+            "entries": len(self.artifacts),
+            "versions": len(versions),
+            "approx_bytes": size,
+        }
@@ -0,0 +1,136 @@
+import json
+import re
+
+BRANDS = (
+    "Samsung",
+    "Apple",
+    "iPhone",
+    "iPad",
+    "MacBook",
+    "OnePlus",
+    "Xiaomi",
+    "Redmi",
+    "Poco",
+    "Realme",
+    "Vivo",
+    "iQOO",
+    "Oppo",
+    "Motorola",
+    "Moto",
+    "Google Pixel",
+    "Pixel",
+    "Nothing Phone",
+    "Lenovo",
+    "HP",
+    "Dell",
+    "Asus",
+    "Acer",
+    "Sony",
+    "LG",
+    "Boat",
+    "JBL",
+    "Bose",
+    "Noise",
+    "Honor",
+    "Infinix",
+    "Tecno",
+    "Nokia",
+)
+
+# "* **Samsung Galaxy F54 5G:** ..." or "1. Samsung Galaxy M34 5G - ..."
+_BOLD_ITEM = re.compile(r"^\s*(?:[*\-•]|\d+[.)])\s+\*\*(.+?)\*\*", re.MULTILINE)
+_PLAIN_ITEM = re.compile(
+    r"^\s*(?:[*\-•]|\d+[.)])\s+([^:\n*]{3,80}?)\s*(?::|\s-\s|\s–\s)", re.MULTILINE
+)
+_BRAND_MENTION = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(b) for b in BRANDS)
+    + r")\b(?:\s+(?:[A-Z0-9][\w+\-]*|i[A-Z]\w*|\(\d+(?:st|nd|rd|th) Gen(?:eration)?\))){1,5}"
+)
+_BRAND = re.compile(
+    r"\b(?:" + "|".join(re.escape(b) for b in BRANDS) + r")\b", re.IGNORECASE
+)
+_MODEL_TOKEN = re.compile(r"\b(?=\w*\d)(?=\w*[A-Za-z])\w+\b|\b\d{1,2}\b")
+
+# The recommender's structured handoff, {"products": [{"brand", "model", ...}]}
+_STRUCTURED = re.compile(r'\{\s*"products"\s*:')
+
+# How much each source of names is trusted
+SOURCE_WEIGHT = {"bold": 1.0, "list": 0.9, "mention": 0.75}
+
+
+def clean_name(name: str) -> str:
+    name = re.sub(r"[*_`]+", "", name).strip(" :-–.,")
+    return " ".join(name.split())
+
+
+def normalize_product_name(product_name: str) -> str:
+    # "**Samsung  Galaxy F54 5G:**" and "samsung galaxy f54 5g" share a key
+    name = re.sub(r"[*_`\"'“”‘’:]+", " ", product_name.lower())
+    return " ".join(name.split())
+
+
+def name_confidence(name: str) -> float:
+    has_brand = bool(_BRAND.search(name))
+    has_model = bool(_MODEL_TOKEN.search(name))
+    if has_brand and has_model:
+        return 1.0
+    if has_brand or has_model:
+        return 0.6
+    return 0.0
+
+
+def structured_products(text: str) -> list[str]:
+    decoder = json.JSONDecoder()
+    for match in _STRUCTURED.finditer(text):
+        try:
+            data, _ = decoder.raw_decode(text, match.start())
+        except ValueError:
+            continue
+        names = []
+        for product in data.get("products") or []:
+            if not isinstance(product, dict):
+                continue
+            name = product.get("name") or " ".join(
+                str(product.get(k, "")).strip() for k in ("brand", "model")
+            )
+            name = clean_name(name)
+            if name and name.lower() not in (n.lower() for n in names):
+                names.append(name)
+        if names:
+            return names
+    return []
+
+
+def extract_products(text: str) -> tuple[list[str], float]:
+    """
+    Pull product names out of a recommender answer without calling an LLM.
+
+    Returns the names in order of appearance and a confidence in [0, 1].
+    Bullets that don't look like products ("**Camera:**") are dropped.
+    A structured product list from the recommender is taken as is.
+    """
+    names = structured_products(text)
+    if names:
+        return names, 1.0
+
+    for source, pattern in (
+        ("bold", _BOLD_ITEM),
+        ("list", _PLAIN_ITEM),
+        ("mention", _BRAND_MENTION),
+    ):
+        names = []
+        scores = []
+        for match in pattern.finditer(text):
+            name = clean_name(match.group(1) if pattern.groups else match.group(0))
+            score = name_confidence(name)
+            if score == 0.0 or name.lower() in (n.lower() for n in names):
+                continue
+            names.append(name)
+            scores.append(score)
+
+        if names:
+            confidence = SOURCE_WEIGHT[source] * sum(scores) / len(scores)
+            return names, round(confidence, 3)
+
+    return [], 0.0
@@ -0,0 +1,84 @@
+from a2a.server.agent_execution import AgentExecutor
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import AgentCard
+from remote_agents.common.stores import (
+    build_task_store,
+    prepare_stores,
+    shared_store,
+    store_stats,
+)
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from typing import Callable
+import logging
+import json
+import os
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+
+def build_app(
+    agent_card: AgentCard,
+    executor: AgentExecutor,
+    stats_sources: dict[str, Callable[[], dict]] | None = None,
+) -> Starlette:
+    """
+    The A2A app of an agent, its tasks kept in the configured store.
+
+    `/stats` reports the stores and resident memory of the worker
+    answering, plus whatever `stats_sources` return under their names.
+    """
+    request_handler = DefaultRequestHandler(
+        agent_executor=executor,
+        task_store=build_task_store(),
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, http_handler=request_handler
+    )
+    app = server.build()
+
+    async def stats(request: Request) -> JSONResponse:
+        extra = {name: source() for name, source in (stats_sources or {}).items()}
+        return JSONResponse({**store_stats(), **extra})
+
+    app.add_route("/stats", stats)
+    return app
+
+
+def app_from_env(create_app: Callable[..., Starlette], options_env: str) -> Starlette:
+    # Entry point of every uvicorn worker, with the options of `serve`
+    return create_app(**json.loads(os.getenv(options_env, "{}")))
+
+
+def serve(
+    create_app: Callable[..., Starlette],
+    options: dict,
+    options_env: str,
+    workers: int = 1,
+    with_sessions: bool = False,
+):
+    """
+    Runs an agent in this process, or in `workers` uvicorn workers each
+    building the app with `server:create_app_from_env`. Agents keeping
+    ADK sessions pass `with_sessions`, so their table is set up too.
+    """
+    host, port = options["host"], options["port"]
+    prepare_stores(with_sessions=with_sessions)
+    if workers == 1:
+        uvicorn.run(create_app(**options), host=host, port=port)
+        return
+
+    if not shared_store():
+        kept = "Tasks and sessions are" if with_sessions else "Tasks are"
+        logger.warning(f"{kept} kept per worker, set AGENT_STORE=sqlite to share them")
+    os.environ[options_env] = json.dumps(options)
+    uvicorn.run(
+        "server:create_app_from_env",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+    )
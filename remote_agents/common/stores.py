@@ -0,0 +1,223 @@
+from a2a.server.tasks import TaskStore
+from a2a.types import Task
+from collections import OrderedDict
+import threading
+import sqlite3
+import time
+import os
+
+# "memory" keeps tasks and sessions in the process, "sqlite" shares them
+# between the workers of one host
+STORE_BACKEND = os.getenv("AGENT_STORE", "memory")
+STORE_PATH = os.getenv("AGENT_STORE_PATH", "agent_store.sqlite3")
+# Seconds a worker waits on another worker's write lock
+STORE_BUSY_TIMEOUT = float(os.getenv("AGENT_STORE_BUSY_TIMEOUT", "30"))
+
+# Caps on what is kept, whichever backend is used
+MAX_TASKS = int(os.getenv("AGENT_STORE_MAX_TASKS", "1000"))
+TASK_TTL = float(os.getenv("AGENT_STORE_TASK_TTL", "3600"))
+MAX_SESSIONS = int(os.getenv("AGENT_STORE_MAX_SESSIONS", "500"))
+SESSION_TTL = float(os.getenv("AGENT_STORE_SESSION_TTL", "3600"))
+MAX_SESSION_EVENTS = int(os.getenv("AGENT_STORE_MAX_SESSION_EVENTS", "200"))
+MAX_ARTIFACTS = int(os.getenv("AGENT_STORE_MAX_ARTIFACTS", "500"))
+# Disk stores are pruned every this many writes
+PRUNE_EVERY = 100
+
+_stores: dict[str, object] = {}
+
+
+def shared_store() -> bool:
+    return STORE_BACKEND == "sqlite"
+
+
+def resident_memory() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # Peak rather than current, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def store_stats() -> dict:
+    return {
+        "backend": STORE_BACKEND,
+        "rss_bytes": resident_memory(),
+        **{name: store.stats() for name, store in _stores.items()},
+    }
+
+
+class SQLiteTaskTable:
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, timeout=STORE_BUSY_TIMEOUT, check_same_thread=False
+        )
+        # Readers don't block the single writer
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, task_id: str) -> tuple[str, float] | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT value, stored_at FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+
+    def put(self, task_id: str, value: str, stored_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks (id, value, stored_at) VALUES (?, ?, ?)",
+                (task_id, value, stored_at),
+            )
+            self._conn.commit()
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            self._conn.commit()
+
+    def prune(self, older_than: float, keep: int) -> int:
+        with self._lock:
+            expired = self._conn.execute(
+                "DELETE FROM tasks WHERE stored_at < ?", (older_than,)
+            ).rowcount
+            overflow = self._conn.execute(
+                "DELETE FROM tasks WHERE id NOT IN "
+                "(SELECT id FROM tasks ORDER BY stored_at DESC LIMIT ?)",
+                (keep,),
+            ).rowcount
+            self._conn.commit()
+        return expired + overflow
+
+    def stats(self) -> tuple[int, int]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM tasks"
+            ).fetchone()
+        return count, size
+
+
+class BoundedTaskStore(TaskStore):
+    """
+    Task store holding at most `max_entries` tasks for at most `ttl` seconds.
+
+    In memory the least recently used task goes first. With `db_path` the
+    tasks live in a SQLite file instead, shared by every worker of the
+    host, and the least recently saved ones are pruned.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MAX_TASKS,
+        ttl: float = TASK_TTL,
+        db_path: str | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._disk = SQLiteTaskTable(db_path) if db_path else None
+        self._writes = 0
+        self.counters = {"saves": 0, "hits": 0, "misses": 0, "evictions": 0}
+
+    def _evict(self):
+        if self._disk is not None:
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                older_than = time.time() - self.ttl
+                pruned = self._disk.prune(older_than, self.max_entries)
+                self.counters["evictions"] += pruned
+            return
+
+        now = time.time()
+        while self._memory:
+            task_id, (_, stored_at) = next(iter(self._memory.items()))
+            if len(self._memory) <= self.max_entries and now - stored_at < self.ttl:
+                break
+            del self._memory[task_id]
+            self.counters["evictions"] += 1
+
+    async def save(self, task: Task, *args) -> None:
+        self.counters["saves"] += 1
+        value = task.model_dump_json()
+        if self._disk is not None:
+            self._disk.put(task.id, value, time.time())
+        else:
+            self._memory.pop(task.id, None)
+            self._memory[task.id] = (value, time.time())
+        self._evict()
+
+    async def get(self, task_id: str, *args) -> Task | None:
+        if self._disk is not None:
+            row = self._disk.get(task_id)
+        else:
+            row = self._memory.get(task_id)
+            if row is not None:
+                self._memory.move_to_end(task_id)
+
+        if row is None or time.time() - row[1] >= self.ttl:
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        return Task.model_validate_json(row[0])
+
+    async def delete(self, task_id: str, *args) -> None:
+        if self._disk is not None:
+            self._disk.delete(task_id)
+        else:
+            self._memory.pop(task_id, None)
+
+    def stats(self) -> dict:
+        if self._disk is not None:
+            entries, size = self._disk.stats()
+        else:
+            entries = len(self._memory)
+            size = sum(len(value) for value, _ in self._memory.values())
+        return {**self.counters, "entries": entries, "approx_bytes": size}
+
+
+def prepare_stores(with_sessions: bool = False):
+    """Set up the shared database once, before any worker starts."""
+    if not shared_store():
+        return
+    # Tables are created here, workers creating them at once would race
+    SQLiteTaskTable(STORE_PATH)
+    if with_sessions:
+        build_session_service()
+
+
+def build_task_store() -> TaskStore:
+    store = BoundedTaskStore(db_path=STORE_PATH if shared_store() else None)
+    _stores["tasks"] = store
+    return store
+
+
+def build_session_service():
+    # ADK is only needed by the agents keeping sessions
+    from remote_agents.common.bounded_sessions import (
+        BoundedDatabaseSessionService,
+        BoundedSessionService,
+    )
+
+    if shared_store():
+        service = BoundedDatabaseSessionService(
+            db_url=f"sqlite:///{STORE_PATH}",
+            connect_args={"timeout": STORE_BUSY_TIMEOUT},
+        )
+    else:
+        service = BoundedSessionService()
+    _stores["sessions"] = service
+    return service
+
+
+def build_artifact_service():
+    from remote_agents.common.bounded_sessions import BoundedArtifactService
+
+    service = BoundedArtifactService()
+    _stores["artifacts"] = service
+    return service
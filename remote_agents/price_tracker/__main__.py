@@ -1,50 +1,32 @@
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-from a2a.types import (
-    AgentCapabilities,
-    AgentCard,
-    AgentSkill,
-)
-from agent import priceTrackerAgent
-from agent_executor import priceTrackerAgentExecutor
+from pathlib import Path
+import sys
+
+# Modules shared by the agents live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from remote_agents.common.serving import serve
+from config import CREW_POOL_SIZE, MAX_QUEUE, STREAMING
+from server import SERVER_OPTIONS_ENV, create_app
 import click
-import uvicorn
 
 
 @click.command()
 @click.option("--host", "host", default="localhost")
 @click.option("--port", "port", default=10001)
-def main(host, port):
+@click.option("--crew-pool-size", "crew_pool_size", default=CREW_POOL_SIZE)
+@click.option("--max-queue", "max_queue", default=MAX_QUEUE)
+@click.option("--streaming/--no-streaming", "streaming", default=STREAMING)
+@click.option("--workers", "workers", default=1)
+def main(host, port, crew_pool_size, max_queue, streaming, workers):
     try:
-        capabilities = AgentCapabilities(streaming=False)
-        skill = AgentSkill(
-            id="price_tracker_agent",
-            name="price_tracker_agent",
-            description=("Fetch the price details of products"),
-            tags=["price fetcher", "price", "amazon"],
-            examples=["Fetch the price of Samsung Galaxy F54 5G"],
-        )
-
-        agent_card = AgentCard(
-            name="price_tracker_agent",
-            description=("Fetch price for the product"),
-            url=f"http://{host}:{port}/",
-            version="1.0.0",
-            defaultInputModes=priceTrackerAgent.SUPPORTED_CONTENT_TYPES,
-            defaultOutputModes=priceTrackerAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
-        )
-
-        request_handler = DefaultRequestHandler(
-            agent_executor=priceTrackerAgentExecutor(),
-            task_store=InMemoryTaskStore(),
-        )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, http_handler=request_handler
+        options = dict(
+            host=host,
+            port=port,
+            streaming=streaming,
+            pool_size=crew_pool_size,
+            max_queue=max_queue,
         )
-        uvicorn.run(server.build(), host=host, port=port)
+        serve(create_app, options, SERVER_OPTIONS_ENV, workers)
 
     except Exception as e:
         exit(1)
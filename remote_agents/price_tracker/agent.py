@@ -2,29 +2,59 @@ from crewai import LLM, Agent, Crew, Task
 from crewai.process import Process
 from crewai_tools import MCPServerAdapter
 from mcp import StdioServerParameters
+from remote_agents.common.product_extractor import extract_products
+from llm_cache import install_completion_cache
+from ollama_client import LLM_MODEL, llm_options
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Any, AsyncIterable
+import statistics
 import logging
+import asyncio
+import time
+import json
+import os
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# MCP Tool Connection (runs live_data.py)
-amazon_server_params = StdioServerParameters(
-    command="python3",
-    args=["live_data.py"],
+# MCP Tool Connection (runs live_data.py), or a shared server started with
+# `python live_data.py --transport streamable-http` when PRICE_TRACKER_MCP_URL is set
+PRICE_TRACKER_MCP_URL = os.getenv("PRICE_TRACKER_MCP_URL")
+if PRICE_TRACKER_MCP_URL:
+    amazon_server_params = {
+        "url": PRICE_TRACKER_MCP_URL,
+        "transport": "streamable-http",
+    }
+else:
+    amazon_server_params = StdioServerParameters(
+        command="python3",
+        args=["live_data.py"],
+    )
+
+# Skip the crew when product names can be pulled out of the query reliably
+FAST_PATH = os.getenv("PRICE_TRACKER_FAST_PATH", "1") == "1"
+FAST_PATH_MIN_CONFIDENCE = float(
+    os.getenv("PRICE_TRACKER_FAST_PATH_MIN_CONFIDENCE", "0.7")
 )
+# Lookups of one streamed request running at once, as amazon_scraper_batch
+STREAM_LOOKUPS = int(os.getenv("PRICE_TRACKER_BATCH_CONCURRENCY", "4"))
 
 
 class priceTrackerAgent:
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
     def __init__(self):
-        self.model = LLM(
-            model="ollama_chat/llama3.1-cpu-custom",
-            base_url="http://localhost:11434",
-            temperature=0.0,
-        )
+        install_completion_cache()
+        # Crews run in threads, all of them share the sync connections
+        self.model = LLM(model=LLM_MODEL, temperature=0.0, **llm_options(sync=True))
 
+        start = time.perf_counter()
         self.amazon_tools = MCPServerAdapter(amazon_server_params)
+        logger.info(
+            f"MCP tools ready in {time.perf_counter() - start:.2f}s "
+            f"({'shared server' if PRICE_TRACKER_MCP_URL else 'stdio subprocess'})"
+        )
 
         self.analyst_task = Agent(
             role="Product Identifier",
@@ -43,8 +73,8 @@ class priceTrackerAgent:
                 Given the user query {user_prompt},
                 - 'products': list of product names mentioned in the query.
 
-                STRICTLY pass only the **products name** as input [Don't add symbols like *] to the tool amazon_scraper ONE by ONE.
-                Then combine the results.
+                STRICTLY pass ALL the **products name** as a list [Don't add symbols like *] to the tool amazon_scraper_batch in a SINGLE call.
+                Use amazon_scraper only if there is exactly one product.
 
                 RETURN the entire tools output (title and its prices).
                 """
@@ -62,14 +92,62 @@ class priceTrackerAgent:
             verbose=True,
         )
 
-    def fetch_product_details(self, product):
-        results = {}
-        for product in products:
-            amazon_tool = self.amazon_tools.tools["amazon_scraper"]
-            amazon_result = amazon_tool.run({"input_str": product})
-            results[product] = {"amazon": amazon_result}
+        self.latencies = {"fast": deque(maxlen=500), "crew": deque(maxlen=500)}
+        # Streamed lookups get their own threads, the crew threads stay free
+        self.lookup_pool = ThreadPoolExecutor(
+            max_workers=STREAM_LOOKUPS, thread_name_prefix="price_tracker_lookup"
+        )
 
-        return results
+    def fetch_product_detail(self, product):
+        amazon_tool = self.amazon_tools.tools["amazon_scraper"]
+        amazon_result = amazon_tool.run(input_str=product)
+        try:
+            return json.loads(amazon_result)
+        except (TypeError, ValueError):
+            return {"error": str(amazon_result)}
+
+    def fetch_product_details(self, products):
+        amazon_tool = self.amazon_tools.tools["amazon_scraper_batch"]
+        amazon_result = amazon_tool.run(input_list=products)
+        try:
+            return json.loads(amazon_result)
+        except (TypeError, ValueError):
+            return {product: {"error": str(amazon_result)} for product in products}
+
+    def format_product_details(self, results: dict) -> str:
+        lines = []
+        for product, result in results.items():
+            lines.append(f"{product}:")
+            if "error" in result:
+                lines.append(f"  - Price not found ({result['error']})")
+                continue
+            for match in result["matches"]:
+                lines.append(f"  - {match['title']}: ₹{match['price']}")
+                if match.get("url"):
+                    lines.append(f"    Link: {match['url']}")
+        return "\n".join(lines)
+
+    def latency_stats(self) -> dict:
+        return {
+            path: {
+                "count": len(timings),
+                "median": round(statistics.median(timings), 3) if timings else None,
+                "max": round(max(timings), 3) if timings else None,
+            }
+            for path, timings in self.latencies.items()
+        }
+
+    def use_fast_path(self, products: list[str], confidence: float) -> bool:
+        return FAST_PATH and bool(products) and confidence >= FAST_PATH_MIN_CONFIDENCE
+
+    def record_latency(self, path: str, start: float, products, confidence):
+        latency = time.perf_counter() - start
+        self.latencies[path].append(latency)
+        logger.info(
+            f"{path} path answered in {latency:.2f}s "
+            f"(products={products}, confidence={confidence}), "
+            f"latency so far: {self.latency_stats()}"
+        )
 
     def invoke(self, query: str, session_id: str = None, session_data: dict = None):
         if session_id:
@@ -78,10 +156,68 @@ class priceTrackerAgent:
         if session_data is None:
             session_data = {}
 
-        crew_response = self.analysis_crew.kickoff({"user_prompt": query})
-        print(crew_response)
+        start = time.perf_counter()
+        products, confidence = extract_products(query)
+
+        if self.use_fast_path(products, confidence):
+            path = "fast"
+            response = self.format_product_details(
+                self.fetch_product_details(products)
+            )
+        else:
+            path = "crew"
+            response = self.analysis_crew.kickoff({"user_prompt": query}).raw
+
+        self.record_latency(path, start, products, confidence)
+        print(response)
+
+        return response
+
+    async def stream(
+        self, query: str, session_id: str = None, run_blocking=None
+    ) -> AsyncIterable[dict[str, Any]]:
+        """
+        Yields each product's prices as soon as its lookup resolves, then
+        all of them in the order of the query.
+
+        Lookups run in the agent's own pool of STREAM_LOOKUPS threads.
+        `run_blocking` runs the crew fallback off the event loop, by default
+        in a new thread. That fallback yields a single final result.
+        """
+        run_blocking = run_blocking or asyncio.to_thread
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        products, confidence = extract_products(query)
+
+        if not self.use_fast_path(products, confidence):
+            yield {"is_task_complete": False, "updates": "Identifying products..."}
+            response = await run_blocking(self.invoke, query, session_id)
+            yield {"is_task_complete": True, "content": response}
+            return
+
+        async def _lookup(product):
+            result = await loop.run_in_executor(
+                self.lookup_pool, self.fetch_product_detail, product
+            )
+            return product, result
 
-        return crew_response
+        results = {}
+        for lookup in asyncio.as_completed([_lookup(p) for p in products]):
+            product, result = await lookup
+            results[product] = result
+            yield {
+                "is_task_complete": False,
+                "product": product,
+                "content": self.format_product_details({product: result}),
+            }
+
+        self.record_latency("fast", start, products, confidence)
+        yield {
+            "is_task_complete": True,
+            "content": self.format_product_details(
+                {product: results[product] for product in products}
+            ),
+        }
 
 
 if __name__ == "__main__":
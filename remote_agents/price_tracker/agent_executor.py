@@ -1,27 +1,50 @@
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import Event, EventQueue
+from a2a.server.tasks import TaskUpdater
 from a2a.utils.errors import ServerError
 from a2a.utils import (
     completed_task,
     new_artifact,
 )
 from a2a.types import (
+    InternalError,
     InvalidParamsError,
     Part,
     Task,
+    TaskState,
     TextPart,
     UnsupportedOperationError,
 )
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from agent import priceTrackerAgent
 from typing_extensions import override
+from config import CREW_POOL_SIZE, MAX_QUEUE, STREAMING
+import functools
+import asyncio
 
 
 class priceTrackerAgentExecutor(AgentExecutor):
-    def __init__(self):
-        self.agent = priceTrackerAgent()
+    def __init__(
+        self,
+        pool_size: int = CREW_POOL_SIZE,
+        max_queue: int = MAX_QUEUE,
+        streaming: bool = STREAMING,
+    ):
+        self.pool_size = pool_size
+        self.max_queue = max_queue
+        self.streaming = streaming
         self.session_store = {}
 
+        # Each worker gets its own crew and MCP adapter, nothing is shared
+        self.agents = asyncio.Queue()
+        for _ in range(pool_size):
+            self.agents.put_nowait(priceTrackerAgent())
+        self.thread_pool = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="price_tracker_crew"
+        )
+        self.admitted = 0
+
     @override
     async def execute(
         self,
@@ -41,16 +64,43 @@ class priceTrackerAgentExecutor(AgentExecutor):
 
         session_data = self.session_store[session_id]
 
-        try:
-            result = self.agent.invoke(
-                query=query, session_id=session_id, session_data=session_data
+        # Reject straight away instead of queueing without bound
+        if self.admitted >= self.pool_size + self.max_queue:
+            raise ServerError(
+                error=InternalError(
+                    message="Price tracker is busy, please retry later",
+                    data={"running": self.pool_size, "queued": self.max_queue},
+                )
             )
 
+        self.admitted += 1
+        try:
+            agent = await self.agents.get()
+            try:
+                if self.streaming:
+                    await self._stream_request(
+                        agent, query, session_id, context, event_queue
+                    )
+                    return
+
+                # Crew kickoff is blocking, keep it off the event loop
+                result = await self._run_blocking(
+                    agent.invoke,
+                    query=query,
+                    session_id=session_id,
+                    session_data=session_data,
+                )
+            finally:
+                self.agents.put_nowait(agent)
+
         except Exception as e:
             print(f"Error invoking for session {session_id}: {e}")
             raise ServerError(error=InvalidParamsError(details=str(e))) from e
 
-        parts = [Part(root=TextPart(text=result.raw))]
+        finally:
+            self.admitted -= 1
+
+        parts = [Part(root=TextPart(text=result))]
 
         await event_queue.enqueue_event(
             completed_task(
@@ -61,6 +111,69 @@ class priceTrackerAgentExecutor(AgentExecutor):
             )
         )
 
+    async def _run_blocking(self, fn, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.thread_pool, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _stream_request(
+        self,
+        agent: priceTrackerAgent,
+        query: str,
+        session_id: str,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ) -> None:
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        if not context.current_task:
+            await updater.submit()
+        await updater.start_work()
+
+        # Every product is appended to one artifact as soon as it resolves,
+        # the last chunk replaces them with all products in query order
+        artifact_id = f"output_{context.task_id}"
+        chunks = 0
+        try:
+            async for item in agent.stream(
+                query, session_id, run_blocking=self._run_blocking
+            ):
+                if item["is_task_complete"]:
+                    await updater.add_artifact(
+                        [Part(root=TextPart(text=item["content"]))],
+                        artifact_id=artifact_id,
+                        append=False,
+                        last_chunk=True,
+                    )
+                    await updater.complete()
+                    break
+
+                if "product" not in item:
+                    await updater.update_status(
+                        TaskState.working,
+                        message=updater.new_agent_message(
+                            [Part(root=TextPart(text=item["updates"]))]
+                        ),
+                    )
+                    continue
+
+                await updater.add_artifact(
+                    [Part(root=TextPart(text=item["content"] + "\n"))],
+                    artifact_id=artifact_id,
+                    metadata={"product": item["product"]},
+                    append=chunks > 0,
+                    last_chunk=False,
+                )
+                chunks += 1
+
+        except Exception as e:
+            await updater.update_status(
+                TaskState.failed,
+                message=updater.new_agent_message(
+                    [Part(root=TextPart(text=f"Error: {str(e)}"))]
+                ),
+                final=True,
+            )
+
     @override
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
@@ -0,0 +1,47 @@
+"""
+Parse latency of the extraction backends over the saved search pages in
+fixtures/.
+
+    python bench_extraction.py --rounds 50
+"""
+
+from extraction import EXTRACTORS
+from pathlib import Path
+import statistics
+import click
+import time
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASE_URL = "https://www.amazon.in"
+
+
+def time_backend(extract, page: str, rounds: int) -> list[float]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        extract(page, BASE_URL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+@click.command()
+@click.option("--rounds", "rounds", default=50)
+def main(rounds):
+    for fixture in sorted(FIXTURES.glob("*.html")):
+        page = fixture.read_text(encoding="utf-8")
+        print(f"\n{fixture.name} ({len(page) / 1024:.0f} KiB)")
+
+        outputs = {name: extract(page, BASE_URL) for name, extract in EXTRACTORS.items()}
+        reference = outputs["bs4"]
+        for name, extract in EXTRACTORS.items():
+            timings = time_backend(extract, page, rounds)
+            matches = "ok" if outputs[name] == reference else "MISMATCH"
+            print(
+                f"  {name:<5} median {statistics.median(timings):7.2f} ms  "
+                f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.2f} ms  "
+                f"{len(outputs[name])} results [{matches}]"
+            )
+
+
+if __name__ == "__main__":
+    main()
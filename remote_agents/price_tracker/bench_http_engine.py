@@ -0,0 +1,106 @@
+"""
+Throughput of the old blocking fetch path vs the pooled async HttpEngine,
+against a local stand-in for the amazon.in search page.
+
+    python bench_http_engine.py --requests 200 --latency 0.05
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http_engine import HttpEngine
+import threading
+import requests
+import asyncio
+import click
+import time
+
+PAGE = (
+    "<html><body>"
+    + "".join(
+        f'<div data-component-type="s-search-result"><h2><span>Product {i}</span></h2>'
+        f'<span class="a-price-whole">{1000 + i}</span></div>'
+        for i in range(20)
+    )
+    + "</body></html>"
+).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.05
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        StandInHandler.connections += 1
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(latency: float):
+    StandInHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_blocking(url: str, total: int):
+    # Previous path: one requests.get per lookup, no session
+    for i in range(total):
+        resp = requests.get(f"{url}/s?k=product+{i}", timeout=10)
+        resp.raise_for_status()
+
+
+async def run_engine(url: str, total: int, per_host: int):
+    engine = HttpEngine(max_per_host=per_host, max_keepalive=per_host)
+    try:
+        await asyncio.gather(
+            *(engine.get_text(f"{url}/s?k=product+{i}") for i in range(total))
+        )
+    finally:
+        await engine.aclose()
+
+
+def report(name: str, total: int, elapsed: float):
+    print(
+        f"{name:<10} {total} requests in {elapsed:.2f}s "
+        f"-> {total / elapsed:.1f} req/s, "
+        f"{StandInHandler.connections} connections opened"
+    )
+
+
+@click.command()
+@click.option("--requests", "total", default=200)
+@click.option("--latency", "latency", default=0.05)
+@click.option("--per-host", "per_host", default=6)
+def main(total, latency, per_host):
+    server = start_server(latency)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    StandInHandler.connections = 0
+    start = time.perf_counter()
+    run_blocking(url, total)
+    blocking = time.perf_counter() - start
+    report("blocking", total, blocking)
+
+    StandInHandler.connections = 0
+    start = time.perf_counter()
+    asyncio.run(run_engine(url, total, per_host))
+    pooled = time.perf_counter() - start
+    report("pooled", total, pooled)
+
+    print(f"speedup: {blocking / pooled:.1f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
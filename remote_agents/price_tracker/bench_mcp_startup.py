@@ -0,0 +1,87 @@
+"""
+Time until the price tools are usable, for a stdio subprocess per agent vs
+a client connecting to one shared streamable HTTP server.
+
+    python bench_mcp_startup.py --rounds 5
+"""
+
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.client.stdio import stdio_client
+from mcp import ClientSession, StdioServerParameters
+import subprocess
+import statistics
+import asyncio
+import click
+import httpx
+import time
+import sys
+
+
+async def connect_stdio() -> float:
+    params = StdioServerParameters(command=sys.executable, args=["live_data.py"])
+    start = time.perf_counter()
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await session.list_tools()
+            return time.perf_counter() - start
+
+
+async def connect_http(url: str) -> float:
+    start = time.perf_counter()
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await session.list_tools()
+            return time.perf_counter() - start
+
+
+def wait_for_server(url: str, timeout: float = 60) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            httpx.get(url, timeout=1)
+            return time.perf_counter() - start
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise TimeoutError(f"MCP server at {url} did not come up")
+
+
+def report(name: str, timings: list[float]):
+    print(
+        f"{name:<24} median {statistics.median(timings) * 1000:8.1f} ms  "
+        f"max {max(timings) * 1000:8.1f} ms"
+    )
+
+
+@click.command()
+@click.option("--rounds", "rounds", default=5)
+@click.option("--port", "port", default=8765)
+def main(rounds, port):
+    timings = [asyncio.run(connect_stdio()) for _ in range(rounds)]
+    report("stdio subprocess", timings)
+
+    url = f"http://localhost:{port}/mcp"
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "live_data.py",
+            "--transport",
+            "streamable-http",
+            "--port",
+            str(port),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        print(f"shared server boot (once) {wait_for_server(url) * 1000:8.1f} ms")
+        timings = [asyncio.run(connect_http(url)) for _ in range(rounds)]
+        report("shared server connect", timings)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Resident memory of the A2A server under sustained traffic, with the task
+store capped and effectively uncapped.
+
+Every round sends a batch of requests to the stand-in executor of
+bench_workers.py, then reads the worker's /stats.
+
+    python bench_memory.py --rounds 10 --requests 500 --cap 1000 --cap 1000000
+"""
+
+from bench_workers import load, wait_for_server
+from pathlib import Path
+import subprocess
+import asyncio
+import click
+import httpx
+import sys
+import os
+
+
+@click.command()
+@click.option("--rounds", "rounds", default=10)
+@click.option("--requests", "requests", default=500)
+@click.option("--concurrency", "concurrency", default=16)
+@click.option("--cap", "caps", multiple=True, default=[1000, 1000000])
+@click.option("--store", "store", default="memory")
+@click.option("--port", "port", default=10102)
+def main(rounds, requests, concurrency, caps, store, port):
+    url = f"http://127.0.0.1:{port}/"
+    print(f"{'cap':>8}{'round':>7}{'tasks':>8}{'evicted':>9}{'task MB':>9}{'RSS MB':>8}")
+    for cap in caps:
+        db = Path(f"bench_store_{os.getpid()}.sqlite3")
+        env = {
+            **os.environ,
+            "AGENT_STORE": store,
+            "AGENT_STORE_PATH": str(db),
+            "AGENT_STORE_MAX_TASKS": str(cap),
+            "BENCH_PORT": str(port),
+        }
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "bench_workers:create_bench_app",
+                "--factory",
+                "--port",
+                str(port),
+                "--log-level",
+                "warning",
+            ],
+            env=env,
+        )
+        try:
+            wait_for_server(url)
+            for round in range(1, rounds + 1):
+                asyncio.run(load(url, requests, concurrency))
+                stats = httpx.get(f"{url}stats").json()
+                tasks = stats["tasks"]
+                print(
+                    f"{cap:>8}{round:>7}{tasks['entries']:>8}{tasks['evictions']:>9}"
+                    f"{tasks['approx_bytes'] / 2**20:>9.1f}"
+                    f"{stats['rss_bytes'] / 2**20:>8.1f}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+            for path in db.parent.glob(f"{db.name}*"):
+                path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Throughput of the A2A server from 1 to N uvicorn workers, and whether a
+task created on one worker can be looked up on any other.
+
+Requests are served by a stand-in executor that parses a saved search
+page with the bs4 backend, CPU bound like a crew run but without the
+LLM and network calls.
+
+    python bench_workers.py --workers 1,2,4 --store memory --store sqlite
+"""
+
+from pathlib import Path
+import sys
+
+# Modules shared by the agents live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Part, TextPart
+from extraction import EXTRACTORS
+from remote_agents.common.stores import prepare_stores
+from server import create_app
+import subprocess
+import statistics
+import asyncio
+import click
+import httpx
+import json
+import time
+import uuid
+import sys
+import os
+
+FIXTURE = Path(__file__).parent / "fixtures" / "amazon_search_samsung_galaxy.html"
+BASE_URL = "https://www.amazon.in"
+
+
+class ExtractionExecutor(AgentExecutor):
+    def __init__(self):
+        self.page = FIXTURE.read_text(encoding="utf-8")
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue):
+        results = EXTRACTORS["bs4"](self.page, BASE_URL)
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.submit()
+        await updater.add_artifact([Part(root=TextPart(text=json.dumps(results[:3])))])
+        await updater.complete()
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue):
+        pass
+
+
+def create_bench_app():
+    port = int(os.getenv("BENCH_PORT", "10101"))
+    return create_app(port=port, streaming=False, executor=ExtractionExecutor())
+
+
+def rpc(method: str, params: dict) -> dict:
+    return {"jsonrpc": "2.0", "id": uuid.uuid4().hex, "method": method, "params": params}
+
+
+async def send_and_lookup(client: httpx.AsyncClient, url: str) -> tuple[float, bool]:
+    message = {
+        "role": "user",
+        "messageId": uuid.uuid4().hex,
+        "parts": [{"kind": "text", "text": "Samsung Galaxy F54 5G"}],
+    }
+    start = time.perf_counter()
+    response = await client.post(url, json=rpc("message/send", {"message": message}))
+    latency = time.perf_counter() - start
+    task_id = response.json()["result"]["id"]
+
+    # A fresh connection, so the lookup may land on another worker
+    lookup = await client.post(url, json=rpc("tasks/get", {"id": task_id}))
+    return latency, "result" in lookup.json()
+
+
+async def load(url: str, requests: int, concurrency: int) -> tuple[list, int, float]:
+    limits = httpx.Limits(max_keepalive_connections=0)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                return await send_and_lookup(client, url)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    latencies = [latency for latency, _ in results]
+    resolved = sum(found for _, found in results)
+    return latencies, resolved, elapsed
+
+
+def wait_for_server(url: str, timeout: float = 60):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            httpx.get(f"{url}.well-known/agent-card.json", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Server at {url} did not come up")
+
+
+@click.command()
+@click.option("--workers", "workers", default="1,2,4")
+@click.option("--store", "stores", multiple=True, default=["memory", "sqlite"])
+@click.option("--requests", "requests", default=200)
+@click.option("--concurrency", "concurrency", default=16)
+@click.option("--port", "port", default=10101)
+def main(workers, stores, requests, concurrency, port):
+    url = f"http://127.0.0.1:{port}/"
+    print(f"{'store':<8}{'workers':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}  lookups")
+    for store in stores:
+        for count in [int(w) for w in workers.split(",")]:
+            db = Path(f"bench_store_{os.getpid()}.sqlite3")
+            env = {
+                **os.environ,
+                "AGENT_STORE": store,
+                "AGENT_STORE_PATH": str(db),
+                "BENCH_PORT": str(port),
+            }
+            if store == "sqlite":
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "-c",
+                        "import bench_workers; bench_workers.prepare_stores()",
+                    ],
+                    env=env,
+                    check=True,
+                )
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "uvicorn",
+                    "bench_workers:create_bench_app",
+                    "--factory",
+                    "--port",
+                    str(port),
+                    "--workers",
+                    str(count),
+                    "--log-level",
+                    "warning",
+                ],
+                env=env,
+            )
+            try:
+                wait_for_server(url)
+                asyncio.run(load(url, concurrency, concurrency))  # warm up
+                latencies, resolved, elapsed = asyncio.run(
+                    load(url, requests, concurrency)
+                )
+                quantiles = statistics.quantiles(latencies, n=20)
+                print(
+                    f"{store:<8}{count:>8}{requests / elapsed:>9.1f}"
+                    f"{statistics.median(latencies) * 1000:>9.1f}"
+                    f"{quantiles[18] * 1000:>9.1f}  {resolved}/{requests}"
+                )
+            finally:
+                server.terminate()
+                server.wait()
+                for path in db.parent.glob(f"{db.name}*"):
+                    path.unlink()
+
+
+if __name__ == "__main__":
+    main()
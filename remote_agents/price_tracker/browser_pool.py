@@ -0,0 +1,202 @@
+from http_engine import DEFAULT_HEADERS
+from dataclasses import dataclass
+import importlib.util
+import logging
+import asyncio
+import time
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# Off by default, needs requirements/browser.txt and `playwright install chromium`
+BROWSER_FALLBACK = os.getenv("PRICE_TRACKER_BROWSER_FALLBACK", "0") == "1"
+BROWSER_POOL_SIZE = int(os.getenv("PRICE_TRACKER_BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_USES = int(os.getenv("PRICE_TRACKER_BROWSER_MAX_USES", "50"))
+BROWSER_MAX_AGE = float(os.getenv("PRICE_TRACKER_BROWSER_MAX_AGE", "600"))
+BROWSER_TIMEOUT = float(os.getenv("PRICE_TRACKER_BROWSER_TIMEOUT", "20"))
+
+
+@dataclass
+class PooledContext:
+    context: object
+    created: float
+    uses: int = 0
+
+
+class BrowserPool:
+    """
+    Warm headless browser contexts shared across lookups.
+
+    At most `size` contexts exist at a time. A context is closed once it
+    has served `max_uses` pages or is older than `max_age` seconds, which
+    keeps the browser's memory bounded.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_uses: int = BROWSER_MAX_USES,
+        max_age: float = BROWSER_MAX_AGE,
+        timeout: float = BROWSER_TIMEOUT,
+    ):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.timeout = timeout
+        self._playwright = None
+        self._browser = None
+        self._idle: list[PooledContext] = []
+        self._slots = asyncio.Semaphore(size)
+        self._start_lock = asyncio.Lock()
+        self.counters = {"fetches": 0, "contexts_created": 0, "contexts_retired": 0}
+
+    async def _ensure_started(self):
+        async with self._start_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            # Optional dependency, only needed once the fallback is hit
+            from playwright.async_api import async_playwright
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._idle.clear()
+
+    async def _new_context(self) -> PooledContext:
+        context = await self._browser.new_context(
+            user_agent=DEFAULT_HEADERS["User-Agent"], locale="en-IN"
+        )
+        self.counters["contexts_created"] += 1
+        return PooledContext(context=context, created=time.monotonic())
+
+    def _expired(self, pooled: PooledContext) -> bool:
+        return (
+            pooled.uses >= self.max_uses
+            or time.monotonic() - pooled.created >= self.max_age
+        )
+
+    async def _retire(self, pooled: PooledContext):
+        self.counters["contexts_retired"] += 1
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.debug(f"Failed to close browser context: {e}")
+
+    async def fetch(self, url: str, wait_for_selector: str | None = None) -> str:
+        await self._ensure_started()
+        async with self._slots:
+            pooled = None
+            while self._idle and pooled is None:
+                candidate = self._idle.pop()
+                if self._expired(candidate):
+                    await self._retire(candidate)
+                else:
+                    pooled = candidate
+            if pooled is None:
+                pooled = await self._new_context()
+
+            try:
+                page = await pooled.context.new_page()
+                try:
+                    await page.goto(
+                        url, wait_until="domcontentloaded", timeout=self.timeout * 1000
+                    )
+                    if wait_for_selector:
+                        try:
+                            await page.wait_for_selector(
+                                wait_for_selector, timeout=self.timeout * 1000
+                            )
+                        except Exception:
+                            logger.debug(f"'{wait_for_selector}' not found on {url}")
+                    html = await page.content()
+                finally:
+                    await page.close()
+            except Exception:
+                await self._retire(pooled)
+                raise
+
+            pooled.uses += 1
+            self.counters["fetches"] += 1
+            if self._expired(pooled):
+                await self._retire(pooled)
+            else:
+                self._idle.append(pooled)
+            return html
+
+    async def close(self):
+        for pooled in self._idle:
+            await self._retire(pooled)
+        self._idle.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "idle_contexts": len(self._idle),
+            "size": self.size,
+            "started": self._browser is not None,
+        }
+
+
+def build_browser_pool() -> BrowserPool | None:
+    if not BROWSER_FALLBACK:
+        return None
+    if importlib.util.find_spec("playwright") is None:
+        logger.warning(
+            "PRICE_TRACKER_BROWSER_FALLBACK is set but playwright is not "
+            "installed, pages rendered by JavaScript are not retried"
+        )
+        return None
+    return BrowserPool()
+
+
+if __name__ == "__main__":
+    # Check the pool against a local stand-in page that renders its results
+    # with JavaScript, like the pages the plain HTTP path can't read.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from extraction import RESULT_MARKER, extract_results
+    import threading
+
+    page = (
+        "<html><body><div id='results'></div><script>"
+        "setTimeout(function () {"
+        "document.getElementById('results').innerHTML = "
+        "'<div data-component-type=\"s-search-result\"><h2><span>Samsung Galaxy F54 5G</span></h2>"
+        "<span class=\"a-price-whole\">22,999</span>"
+        "<a class=\"a-link-normal\" href=\"/dp/B0C7\">link</a></div>';"
+        "}, 200);</script></body></html>"
+    ).encode()
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/s?k=samsung"
+
+    async def _check():
+        pool = BrowserPool(size=1, max_uses=2)
+        try:
+            for _ in range(3):
+                html = await pool.fetch(url, wait_for_selector=f"div[{RESULT_MARKER}]")
+                print(extract_results(html, url))
+            print(pool.stats())
+        finally:
+            await pool.close()
+
+    asyncio.run(_check())
+    server.shutdown()
@@ -0,0 +1,12 @@
+import os
+
+# Kept apart from agent_executor.py so __main__.py can read them without
+# importing the crew stack into the process that only starts workers
+
+# Crews that can run at once, and requests allowed to wait for one
+CREW_POOL_SIZE = int(os.getenv("PRICE_TRACKER_CREW_POOL_SIZE", "2"))
+MAX_QUEUE = int(os.getenv("PRICE_TRACKER_MAX_QUEUE", "8"))
+# Emit each product's prices as an artifact chunk as soon as it resolves.
+# Off by default: the orchestrator sends non-streaming requests, and the
+# single batch lookup of a non-streamed request is faster
+STREAMING = os.getenv("PRICE_TRACKER_STREAMING", "0") == "1"
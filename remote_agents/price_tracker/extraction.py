@@ -0,0 +1,146 @@
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+import logging
+import html as html_lib
+import re
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# "fast" walks only the search result nodes, "bs4" parses the whole page
+EXTRACTOR = os.getenv("PRICE_TRACKER_EXTRACTOR", "fast")
+
+RESULT_MARKER = 'data-component-type="s-search-result"'
+
+_DIV_TAG = re.compile(r"<(/?)div\b", re.IGNORECASE)
+_H2 = re.compile(r"<h2\b[^>]*>(.*?)</h2>", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]+>")
+_PRICE_WHOLE = re.compile(
+    r"<span\b[^>]*class=\"[^\"]*\ba-price-whole\b[^\"]*\"[^>]*>([^<]*)", re.IGNORECASE
+)
+_PRICE_FRACTION = re.compile(
+    r"<span\b[^>]*class=\"[^\"]*\ba-price-fraction\b[^\"]*\"[^>]*>([^<]*)",
+    re.IGNORECASE,
+)
+_ANCHOR = re.compile(r"<a\b[^>]*>", re.IGNORECASE)
+_CLASS_ATTR = re.compile(r"\bclass=\"([^\"]*)\"", re.IGNORECASE)
+_HREF_ATTR = re.compile(r"\bhref=\"([^\"]*)\"", re.IGNORECASE)
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def _clean_text(text: str) -> str:
+    return " ".join(html_lib.unescape(text).split())
+
+
+def _join_price(whole: str | None, fraction: str | None) -> str | None:
+    if not whole:
+        return None
+    # a-price-whole carries a trailing a-price-decimal "."
+    price = whole.strip().rstrip(".")
+    if fraction:
+        price += "." + fraction.strip()
+    return price
+
+
+def _result_blocks(page: str):
+    pos = page.find(RESULT_MARKER)
+    while pos != -1:
+        start = page.rfind("<div", 0, pos)
+        end = len(page)
+        depth = 0
+        for m in _DIV_TAG.finditer(page, start):
+            depth += -1 if m.group(1) else 1
+            if depth == 0:
+                end = m.end()
+                break
+        yield page[start:end]
+        pos = page.find(RESULT_MARKER, end)
+
+
+def _first_link(block: str) -> str | None:
+    for m in _ANCHOR.finditer(block):
+        tag = m.group(0)
+        class_attr = _CLASS_ATTR.search(tag)
+        href = _HREF_ATTR.search(tag)
+        if class_attr and href and "a-link-normal" in class_attr.group(1).split():
+            return html_lib.unescape(href.group(1))
+    return None
+
+
+def extract_fast(page: str, base_url: str) -> list[dict]:
+    results = []
+    for block in _result_blocks(page):
+        h2 = _H2.search(block)
+        if not h2:
+            continue
+        whole = _PRICE_WHOLE.search(block)
+        fraction = _PRICE_FRACTION.search(block)
+        link = _first_link(block)
+        results.append(
+            {
+                "title": _clean_text(_TAG.sub(" ", h2.group(1))),
+                "price": _join_price(
+                    whole.group(1) if whole else None,
+                    fraction.group(1) if fraction else None,
+                ),
+                "url": urljoin(base_url, link) if link else None,
+            }
+        )
+    return results
+
+
+def extract_bs4(page: str, base_url: str) -> list[dict]:
+    soup = BeautifulSoup(page, "html.parser")
+    results = []
+    for item in soup.find_all("div", {"data-component-type": "s-search-result"}):
+        # To get the product title
+        title_tag = item.h2
+        if not title_tag:
+            continue
+
+        # To fetch price
+        price_whole = item.select_one("span.a-price-whole")
+        price_fraction = item.select_one("span.a-price-fraction")
+
+        # To fetch the product link
+        link_tag = item.find("a", {"class": "a-link-normal", "href": True})
+
+        results.append(
+            {
+                "title": _clean_text(title_tag.get_text(" ")),
+                "price": _join_price(
+                    price_whole.find(string=True) if price_whole else None,
+                    price_fraction.get_text() if price_fraction else None,
+                ),
+                "url": urljoin(base_url, link_tag["href"]) if link_tag else None,
+            }
+        )
+    return results
+
+
+EXTRACTORS = {
+    "fast": extract_fast,
+    "bs4": extract_bs4,
+}
+
+
+def extract_results(page: str, base_url: str, backend: str | None = None) -> list[dict]:
+    backend = backend or EXTRACTOR
+    if backend not in EXTRACTORS:
+        raise ExtractionError(f"Unknown extractor backend '{backend}'")
+
+    if backend != "bs4":
+        try:
+            results = EXTRACTORS[backend](page, base_url)
+            # Markup we don't understand, let BeautifulSoup have a go
+            if results or RESULT_MARKER not in page:
+                return results
+            logger.debug(f"Extractor '{backend}' found no results, using bs4")
+        except Exception as e:
+            logger.warning(f"Extractor '{backend}' failed, using bs4: {e}")
+
+    return extract_bs4(page, base_url)
@@ -0,0 +1,107 @@
+from urllib.parse import urlsplit
+import logging
+import asyncio
+import httpx
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+# Pool settings, can be overridden from the environment of the MCP server
+CONNECT_TIMEOUT = float(os.getenv("PRICE_TRACKER_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("PRICE_TRACKER_READ_TIMEOUT", "10"))
+MAX_CONNECTIONS = int(os.getenv("PRICE_TRACKER_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE = int(os.getenv("PRICE_TRACKER_MAX_KEEPALIVE", "10"))
+MAX_PER_HOST = int(os.getenv("PRICE_TRACKER_MAX_PER_HOST", "6"))
+KEEPALIVE_EXPIRY = float(os.getenv("PRICE_TRACKER_KEEPALIVE_EXPIRY", "60"))
+
+
+class FetchError(Exception):
+    def __init__(self, url: str, status: int | None, message: str):
+        super().__init__(message)
+        self.url = url
+        self.status = status
+
+
+class HttpEngine:
+    """Async HTTP fetcher with a shared keep-alive pool and per-host limits."""
+
+    def __init__(
+        self,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive: int = MAX_KEEPALIVE,
+        max_per_host: int = MAX_PER_HOST,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        headers: dict | None = None,
+    ):
+        self.timeout = httpx.Timeout(
+            read_timeout, connect=connect_timeout, pool=connect_timeout
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_per_host = max_per_host
+        self.headers = headers or DEFAULT_HEADERS
+        self._client: httpx.AsyncClient | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                follow_redirects=True,
+            )
+        return self._client
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_slots[host]
+
+    async def get_response(self, url: str, params: dict | None = None) -> httpx.Response:
+        client = self._get_client()
+        async with self._host_slot(url):
+            try:
+                return await client.get(url, params=params)
+            except httpx.TimeoutException as e:
+                raise FetchError(url, None, f"Timed out fetching {url}") from e
+            except httpx.HTTPError as e:
+                raise FetchError(url, None, f"Failed to fetch {url}: {e}") from e
+
+    async def get_text(self, url: str, params: dict | None = None) -> str:
+        resp = await self.get_response(url, params=params)
+        if resp.status_code != 200:
+            raise FetchError(
+                url,
+                resp.status_code,
+                f"Failed to fetch page, status: {resp.status_code}",
+            )
+        return resp.text
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_engine: HttpEngine | None = None
+
+
+def get_engine() -> HttpEngine:
+    global _engine
+    if _engine is None:
+        _engine = HttpEngine()
+    return _engine
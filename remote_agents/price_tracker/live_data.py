@@ -1,12 +1,23 @@
-from playwright.sync_api import sync_playwright
+from pathlib import Path
+import sys
+
+# Modules shared by the agents live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from browser_pool import build_browser_pool
+from extraction import RESULT_MARKER, extract_results
 from mcp.server.fastmcp import FastMCP
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from http_engine import get_engine
+from rate_limiter import PacedFetcher
+from singleflight import SingleFlight
+from price_cache import PriceCache
+from ranking import rank_candidates
 import logging
 import yfinance
-import requests
+import click
 import asyncio
 import re
+import os
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -14,61 +25,147 @@ logger.setLevel(logging.DEBUG)
 # Initialize MCP Server
 mcp_server = FastMCP(name="AmazonPriceTracker")
 
+# Can be pointed to a local stand-in server for benchmarks
+AMAZON_BASE_URL = os.getenv("AMAZON_BASE_URL", "https://www.amazon.in")
 
-def get_product_by_name(search_url, product_name):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36",
-    }
-    resp = requests.get(search_url, headers=headers, timeout=10)
-    if resp.status_code != 200:
-        raise Exception(f"Failed to fetch page, status: {resp.status_code}")
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-    results = soup.find_all("div", {"data-component-type": "s-search-result"})
-
-    for item in results:
-        # To get the product title
-        title_tag = item.h2
-        if not title_tag:
-            continue
-
-        title = title_tag.get_text(strip=True)
-
-        if product_name.lower() in title.lower():
-            # To fetch price
-            price_whole = item.select_one("span.a-price-whole")
-            price_fraction = item.select_one("span.a-price-fraction")
-            if not price_whole:
+# Concurrency cap for amazon_scraper_batch
+BATCH_CONCURRENCY = int(os.getenv("PRICE_TRACKER_BATCH_CONCURRENCY", "4"))
+MAX_BATCH_CONCURRENCY = int(os.getenv("PRICE_TRACKER_MAX_BATCH_CONCURRENCY", "8"))
+
+# Candidate ranking and how many result pages one lookup may read
+MAX_PAGES = int(os.getenv("PRICE_TRACKER_MAX_PAGES", "3"))
+MAX_TOP_K = int(os.getenv("PRICE_TRACKER_MAX_TOP_K", "5"))
+MIN_MATCH_SCORE = float(os.getenv("PRICE_TRACKER_MIN_MATCH_SCORE", "0.5"))
+STRONG_MATCH_SCORE = float(os.getenv("PRICE_TRACKER_STRONG_MATCH_SCORE", "0.85"))
+
+fetcher = PacedFetcher(get_engine())
+browser_pool = build_browser_pool()
+price_cache = PriceCache()
+in_flight = SingleFlight()
+
+
+async def get_search_results(product_name: str, page: int = 1) -> list[dict]:
+    product_name_for_url = product_name.replace(" ", "+")
+    search_url = f"{AMAZON_BASE_URL}/s?k={product_name_for_url}"
+    if page > 1:
+        search_url += f"&page={page}"
+
+    # Shared keep-alive pool, paced per host with budgeted retries
+    html = await fetcher.get_text(search_url)
+    items = extract_results(html, AMAZON_BASE_URL)
+
+    # Page rendered by JavaScript, fall back to a pooled headless browser
+    if not items and page == 1 and browser_pool is not None:
+        logger.info(f"No search results in HTML for '{product_name}', using browser")
+        html = await browser_pool.fetch(
+            search_url, wait_for_selector=f"div[{RESULT_MARKER}]"
+        )
+        items = extract_results(html, AMAZON_BASE_URL)
+
+    return items
+
+
+async def fetch_product(product_name: str):
+    items = await get_search_results(product_name)
+    matches = rank_candidates(product_name, items, MIN_MATCH_SCORE)
+
+    # Only look past the first page when it has no convincing match
+    if (not matches or matches[0]["score"] < STRONG_MATCH_SCORE) and MAX_PAGES > 1:
+        pages = await asyncio.gather(
+            *(get_search_results(product_name, p) for p in range(2, MAX_PAGES + 1)),
+            return_exceptions=True,
+        )
+        for page_items in pages:
+            if isinstance(page_items, Exception):
+                logger.warning(f"Extra page failed for '{product_name}': {page_items}")
                 continue
+            items.extend(page_items)
+        matches = rank_candidates(product_name, items, MIN_MATCH_SCORE)
 
-            price = price_whole.get_text(strip=True)
-            if price_fraction:
-                price += "." + price_fraction.get_text(strip=True)
+    if not matches:
+        raise Exception(f"No product found matching '{product_name}'")
 
-            # To fetch the product link
-            link_tag = item.find("a", {"class": "a-link-normal", "href": True})
-            product_url = (
-                urljoin("https://www.amazon.in", link_tag["href"]) if link_tag else None
-            )
+    return {"query": product_name, "matches": matches[:MAX_TOP_K]}
 
-            return {"title": title, "price": price, "url": product_url}
 
-    raise Exception(f"No product found matching '{product_name}'")
+def top_matches(result: dict, top_k: int) -> dict:
+    return {**result, "matches": result["matches"][: max(1, top_k)]}
+
+
+async def coalesced_fetch(product_name: str):
+    # Concurrent lookups of the same product share one scrape
+    return await in_flight.do(product_name, lambda: fetch_product(product_name))
+
+
+async def lookup_product(product_name: str):
+    return await price_cache.get_or_fetch(product_name, coalesced_fetch)
 
 
 @mcp_server.tool(
-    name="amazon_scraper", description="Fetch price of the first Amazon product."
+    name="amazon_scraper",
+    description="Fetch titles, prices and links of the best matching Amazon products.",
 )
-async def amazon_scraper(input_str: str):
-    product_name = input_str
-    product_name_for_url = product_name.replace(" ", "+")
-    url = f"https://www.amazon.in/s?k={product_name_for_url}"
-    product = get_product_by_name(url, product_name)
+async def amazon_scraper(input_str: str, top_k: int = 3):
+    return top_matches(await lookup_product(input_str), top_k)
 
-    return product
 
+@mcp_server.tool(
+    name="amazon_scraper_batch",
+    description="Fetch prices of several Amazon products in one call. "
+    "Pass all product names as a list.",
+)
+async def amazon_scraper_batch(
+    input_list: list[str], top_k: int = 3, max_concurrency: int = BATCH_CONCURRENCY
+):
+    # Skip empty and duplicate names, keep the order of the input
+    product_names = list(dict.fromkeys(p.strip() for p in input_list if p.strip()))
+    limit = asyncio.Semaphore(max(1, min(max_concurrency, MAX_BATCH_CONCURRENCY)))
+
+    async def _lookup(product_name):
+        async with limit:
+            try:
+                return top_matches(await lookup_product(product_name), top_k)
+            except Exception as e:
+                logger.warning(f"Lookup failed for '{product_name}': {e}")
+                return {"error": str(e)}
+
+    results = await asyncio.gather(*(_lookup(p) for p in product_names))
+    return dict(zip(product_names, results))
+
+
+@mcp_server.tool(
+    name="scraper_stats",
+    description="Cache, coalescing, rate limiter and browser pool counters of the scraper.",
+)
+async def scraper_stats():
+    return {
+        "cache": price_cache.stats(),
+        "coalescing": in_flight.stats(),
+        "limiter": fetcher.snapshot(),
+        "browser": browser_pool.stats() if browser_pool is not None else None,
+    }
+
+
+@click.command()
+@click.option(
+    "--transport",
+    "transport",
+    default="stdio",
+    type=click.Choice(["stdio", "streamable-http"]),
+)
+@click.option("--host", "host", default="localhost")
+@click.option("--port", "port", default=8765)
+def main(transport, host, port):
+    if transport == "streamable-http":
+        # One long-lived process shared by every crew, caches and pools stay warm
+        mcp_server.settings.host = host
+        mcp_server.settings.port = port
+        mcp_server.settings.stateless_http = True
+        logger.info(f"Serving MCP tools at http://{host}:{port}/mcp")
 
-if __name__ == "__main__":
     print("MCP [Amazon_Price_Fetcher] server started...")
-    mcp_server.run(transport="stdio")
+    mcp_server.run(transport=transport)
+
+
+if __name__ == "__main__":
+    main()
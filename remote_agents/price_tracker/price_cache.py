@@ -0,0 +1,174 @@
+from remote_agents.common.product_extractor import normalize_product_name
+from collections import OrderedDict
+from pathlib import Path
+import threading
+import logging
+import asyncio
+import sqlite3
+import json
+import time
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", "300"))
+PRICE_CACHE_GRACE = float(os.getenv("PRICE_CACHE_GRACE", "600"))
+PRICE_CACHE_MAX_ENTRIES = int(os.getenv("PRICE_CACHE_MAX_ENTRIES", "1024"))
+# Set to an empty string to keep the cache in memory only
+PRICE_CACHE_DB = os.getenv(
+    "PRICE_CACHE_DB", str(Path(__file__).parent / "price_cache.sqlite3")
+)
+
+
+class SQLitePriceStore:
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS prices ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> tuple[dict, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM prices WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, value: dict, stored_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prices (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), stored_at),
+            )
+            self._conn.commit()
+
+    def prune(self, older_than: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM prices WHERE stored_at < ?", (older_than,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+class PriceCache:
+    """
+    Two tier cache of lookup results keyed by normalized product name.
+
+    Entries younger than `ttl` are served as is. Entries within the
+    following `grace` window are served stale while a background task
+    refreshes them. Anything older is fetched again.
+    """
+
+    def __init__(
+        self,
+        ttl: float = PRICE_CACHE_TTL,
+        grace: float = PRICE_CACHE_GRACE,
+        max_entries: int = PRICE_CACHE_MAX_ENTRIES,
+        db_path: str | None = PRICE_CACHE_DB,
+    ):
+        self.ttl = ttl
+        self.grace = grace
+        self.max_entries = max_entries
+        self._memory: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._disk = SQLitePriceStore(db_path) if db_path else None
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._writes = 0
+        self.counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+        }
+
+    def _get_entry(self, key: str) -> tuple[dict, float, str] | None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            value, stored_at = self._memory[key]
+            return value, stored_at, "memory"
+
+        if self._disk is not None:
+            entry = self._disk.get(key)
+            if entry is not None:
+                self._remember(key, *entry)
+                return entry[0], entry[1], "disk"
+
+        return None
+
+    def _remember(self, key: str, value: dict, stored_at: float):
+        self._memory[key] = (value, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def put(self, key: str, value: dict):
+        stored_at = time.time()
+        self._remember(key, value, stored_at)
+        if self._disk is not None:
+            self._disk.put(key, value, stored_at)
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._disk.prune(stored_at - self.ttl - self.grace)
+
+    async def get_or_fetch(self, product_name: str, fetch):
+        key = normalize_product_name(product_name)
+        entry = self._get_entry(key)
+
+        if entry is not None:
+            value, stored_at, tier = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self.counters[f"{tier}_hits"] += 1
+                return value
+            if age < self.ttl + self.grace:
+                self.counters["stale_hits"] += 1
+                self._refresh_in_background(key, fetch)
+                return value
+
+        self.counters["misses"] += 1
+        value = await fetch(key)
+        self.put(key, value)
+        return value
+
+    def _refresh_in_background(self, key: str, fetch):
+        if key in self._refreshing:
+            return
+
+        async def _refresh():
+            try:
+                self.put(key, await fetch(key))
+                self.counters["refreshes"] += 1
+            except Exception as e:
+                self.counters["refresh_errors"] += 1
+                logger.warning(f"Background refresh failed for '{key}': {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(_refresh())
+
+    def stats(self) -> dict:
+        hits = (
+            self.counters["memory_hits"]
+            + self.counters["disk_hits"]
+            + self.counters["stale_hits"]
+        )
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "refreshing": len(self._refreshing),
+            "ttl": self.ttl,
+            "grace": self.grace,
+        }
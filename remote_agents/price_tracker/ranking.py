@@ -0,0 +1,65 @@
+import re
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Titles with these words are usually accessories for the product searched
+ACCESSORY_WORDS = {
+    "case",
+    "cover",
+    "charger",
+    "adapter",
+    "cable",
+    "protector",
+    "guard",
+    "tempered",
+    "skin",
+    "stand",
+    "holder",
+    "pouch",
+    "strap",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def match_score(query: str, title: str) -> float:
+    query_tokens = tokenize(query)
+    if not query_tokens:
+        return 0.0
+    title_tokens = tokenize(title)
+    title_set = set(title_tokens)
+
+    # Model numbers ("f54", "5g", "128gb") tell products apart, weigh them more.
+    # Bare numbers also show up in screen sizes and prices, so they don't.
+    weights = [
+        2.0 if any(c.isdigit() for c in t) and not t.isdigit() else 1.0
+        for t in query_tokens
+    ]
+    matched = sum(w for t, w in zip(query_tokens, weights) if t in title_set)
+    coverage = matched / sum(weights)
+
+    phrase = " ".join(query_tokens) in " ".join(title_tokens)
+    score = 0.9 * coverage + (0.1 if phrase else 0.0)
+
+    if (ACCESSORY_WORDS & title_set) - set(query_tokens):
+        score *= 0.5
+    return round(score, 3)
+
+
+def rank_candidates(query: str, items: list[dict], min_score: float) -> list[dict]:
+    scored = []
+    seen = set()
+    for item in items:
+        # Items without a price are unavailable, pages can repeat items
+        key = item["title"].lower()
+        if not item["price"] or key in seen:
+            continue
+        seen.add(key)
+        score = match_score(query, item["title"])
+        if score >= min_score:
+            scored.append({**item, "score": score})
+
+    # Stable sort keeps Amazon's relevance order between equal scores
+    return sorted(scored, key=lambda item: item["score"], reverse=True)
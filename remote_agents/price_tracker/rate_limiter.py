@@ -0,0 +1,242 @@
+from http_engine import FetchError, HttpEngine, MAX_PER_HOST
+from urllib.parse import urlsplit
+import logging
+import asyncio
+import random
+import time
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+HOST_RATE = float(os.getenv("PRICE_TRACKER_HOST_RATE", "2"))
+HOST_BURST = float(os.getenv("PRICE_TRACKER_HOST_BURST", "4"))
+MAX_WAIT = float(os.getenv("PRICE_TRACKER_MAX_WAIT", "10"))
+MAX_RETRIES = int(os.getenv("PRICE_TRACKER_MAX_RETRIES", "3"))
+RETRY_BUDGET = float(os.getenv("PRICE_TRACKER_RETRY_BUDGET", "0.2"))
+BACKOFF_BASE = float(os.getenv("PRICE_TRACKER_BACKOFF_BASE", "0.5"))
+BACKOFF_CAP = float(os.getenv("PRICE_TRACKER_BACKOFF_CAP", "8"))
+
+THROTTLE_STATUSES = {429, 503}
+# Markers of the robot check page amazon.in serves with a 200 status
+THROTTLE_MARKERS = (
+    "api-services-support@amazon.com",
+    "/errors/validateCaptcha",
+    "Type the characters you see in this image",
+)
+
+
+class RateLimited(Exception):
+    pass
+
+
+def is_throttled(status: int, text: str) -> bool:
+    if status in THROTTLE_STATUSES:
+        return True
+    return status == 200 and any(marker in text for marker in THROTTLE_MARKERS)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, max_wait: float):
+        # Callers queue on the lock so tokens are handed out in order
+        async with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(self.paused_until - now, (1 - self.tokens) / self.rate, 0.0)
+            if wait > max_wait:
+                raise RateLimited(f"Rate limited, next slot in {wait:.1f}s")
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self._refill(time.monotonic())
+            self.tokens -= 1
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight requests: +1/limit per success, halved on throttle."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self, max_wait: float):
+        async with self._cond:
+            try:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: self.in_flight < int(self.limit)),
+                    max_wait,
+                )
+            except asyncio.TimeoutError:
+                raise RateLimited(
+                    f"Rate limited, {self.in_flight} requests in flight"
+                ) from None
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_throttle(self):
+        self.limit = max(self.min_limit, self.limit / 2)
+
+
+class RetryBudget:
+    """Every request earns `ratio` of a retry, so retries stay a fraction of traffic."""
+
+    def __init__(self, ratio: float, min_balance: float = 3):
+        self.ratio = ratio
+        self.balance = min_balance
+        self.cap = max(min_balance, 100 * ratio)
+
+    def deposit(self):
+        self.balance = min(self.cap, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+class HostLimiter:
+    def __init__(self, rate: float, burst: float, max_concurrency: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.budget = RetryBudget(RETRY_BUDGET)
+        self.counters = {
+            "requests": 0,
+            "successes": 0,
+            "throttled": 0,
+            "rejected": 0,
+            "retries": 0,
+            "budget_exhausted": 0,
+        }
+
+    async def acquire(self, max_wait: float):
+        try:
+            await self.bucket.acquire(max_wait)
+            await self.concurrency.acquire(max_wait)
+        except RateLimited:
+            self.counters["rejected"] += 1
+            raise
+        self.counters["requests"] += 1
+        self.budget.deposit()
+
+    def snapshot(self) -> dict:
+        return {
+            **self.counters,
+            "rate": self.bucket.rate,
+            "tokens": round(self.bucket.tokens, 2),
+            "paused_for": round(max(0.0, self.bucket.paused_until - time.monotonic()), 2),
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "retry_balance": round(self.budget.balance, 2),
+        }
+
+
+class PacedFetcher:
+    """Fetches through a per-host limiter with jittered, budgeted retries."""
+
+    def __init__(
+        self,
+        engine: HttpEngine,
+        rate: float = HOST_RATE,
+        burst: float = HOST_BURST,
+        max_concurrency: int = MAX_PER_HOST,
+        max_wait: float = MAX_WAIT,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.engine = engine
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._hosts: dict[str, HostLimiter] = {}
+
+    def limiter(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = HostLimiter(
+                self.rate, self.burst, self.max_concurrency
+            )
+        return self._hosts[host]
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+    async def get_text(self, url: str) -> str:
+        limiter = self.limiter(url)
+        attempt = 0
+        while True:
+            await limiter.acquire(self.max_wait)
+            retry_after = None
+            try:
+                resp = await self.engine.get_response(url)
+                if is_throttled(resp.status_code, resp.text):
+                    limiter.counters["throttled"] += 1
+                    limiter.concurrency.on_throttle()
+                    retry_after = resp.headers.get("Retry-After")
+                    error = FetchError(url, resp.status_code, "Throttled by target host")
+                elif resp.status_code == 200:
+                    limiter.counters["successes"] += 1
+                    limiter.concurrency.on_success()
+                    return resp.text
+                elif resp.status_code < 500:
+                    raise FetchError(
+                        url,
+                        resp.status_code,
+                        f"Failed to fetch page, status: {resp.status_code}",
+                    )
+                else:
+                    error = FetchError(
+                        url,
+                        resp.status_code,
+                        f"Failed to fetch page, status: {resp.status_code}",
+                    )
+            except FetchError as e:
+                if e.status is not None:
+                    raise
+                error = e
+            finally:
+                await limiter.concurrency.release()
+
+            if attempt >= self.max_retries:
+                raise error
+            if not limiter.budget.withdraw():
+                limiter.counters["budget_exhausted"] += 1
+                raise error
+
+            delay = self._backoff(attempt)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+                limiter.bucket.pause(delay)
+            attempt += 1
+            limiter.counters["retries"] += 1
+            logger.info(f"Retrying {url} in {delay:.2f}s ({error})")
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> dict:
+        return {host: limiter.snapshot() for host, limiter in self._hosts.items()}
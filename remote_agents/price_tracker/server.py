@@ -0,0 +1,66 @@
+from a2a.server.agent_execution import AgentExecutor
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+)
+from remote_agents.common.serving import app_from_env, build_app
+from llm_cache import completion_cache_stats
+from ollama_client import readiness, start_warm_up
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+# Options of `python __main__.py`, handed to worker processes
+SERVER_OPTIONS_ENV = "PRICE_TRACKER_SERVER_OPTIONS"
+SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
+
+
+async def ready(request: Request) -> JSONResponse:
+    # 200 once the model is loaded in Ollama, for load balancers and scripts
+    status = await readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+def create_app(
+    host: str = "localhost",
+    port: int = 10001,
+    streaming: bool = True,
+    executor: AgentExecutor | None = None,
+    **executor_options,
+) -> Starlette:
+    capabilities = AgentCapabilities(streaming=streaming)
+    skill = AgentSkill(
+        id="price_tracker_agent",
+        name="price_tracker_agent",
+        description=("Fetch the price details of products"),
+        tags=["price fetcher", "price", "amazon"],
+        examples=["Fetch the price of Samsung Galaxy F54 5G"],
+    )
+
+    agent_card = AgentCard(
+        name="price_tracker_agent",
+        description=("Fetch price for the product"),
+        url=f"http://{host}:{port}/",
+        version="1.0.0",
+        defaultInputModes=SUPPORTED_CONTENT_TYPES,
+        defaultOutputModes=SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=[skill],
+    )
+
+    if executor is None:
+        # Imported here, the crew stack is heavy and benchmarks bring their own
+        from agent_executor import priceTrackerAgentExecutor
+
+        executor = priceTrackerAgentExecutor(streaming=streaming, **executor_options)
+        start_warm_up()
+
+    # Hits of the LLM completion cache it shares with other processes
+    app = build_app(agent_card, executor, {"llm_cache": completion_cache_stats})
+    app.add_route("/ready", ready)
+    return app
+
+
+def create_app_from_env() -> Starlette:
+    return app_from_env(create_app, SERVER_OPTIONS_ENV)
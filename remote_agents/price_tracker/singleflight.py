@@ -0,0 +1,32 @@
+import asyncio
+
+
+class SingleFlight:
+    """Concurrent calls for the same key share one in-flight task."""
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self.counters = {"calls": 0, "shared": 0}
+
+    async def do(self, key: str, fn):
+        self.counters["calls"] += 1
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.counters["shared"] += 1
+
+        # A cancelled waiter must not cancel the fetch the others are waiting on
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the error as retrieved in case every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {**self.counters, "in_flight": len(self._calls)}
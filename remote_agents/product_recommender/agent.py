@@ -1,14 +1,26 @@
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.artifacts import InMemoryArtifactService
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.sessions import InMemorySessionService
+from remote_agents.common.stores import build_artifact_service, build_session_service
 from google.adk.runners import Runner
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools import google_search
 from typing import Any, AsyncIterable
 from google.genai import types
+from response_cache import CACHE_ENABLED, SemanticResponseCache
+from structured_output import PRODUCTS_INSTRUCTION, split_products
+from remote_agents.common.product_extractor import extract_products
+import logging
 import asyncio
+import time
 import json
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Stream the answer so product names are announced while it is still written
+STREAMING = os.getenv("RECOMMENDER_STREAMING", "1") == "1"
 
 
 class productRecommenderAgent:
@@ -20,8 +32,12 @@ class productRecommenderAgent:
         self._runner = Runner(
             app_name=self._agent.name,
             agent=self._agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            artifact_service=build_artifact_service(),
+            session_service=build_session_service(),
+        )
+        self._cache = SemanticResponseCache() if CACHE_ENABLED else None
+        self._run_config = RunConfig(
+            streaming_mode=StreamingMode.SSE if STREAMING else StreamingMode.NONE
         )
 
     def get_processing_message(self) -> str:
@@ -34,10 +50,24 @@ class productRecommenderAgent:
             description="Agent to answer question using Google Search.",
             instruction="""
             Suggest 3-4 products for the query by searching the internet. Use tools to address it.
-            """,
+            """
+            + PRODUCTS_INSTRUCTION,
             tools=[google_search],
         )
 
+    def _announce(self, names: list[str], confidence: float) -> dict[str, Any]:
+        return {
+            "is_task_complete": False,
+            "updates": self.get_processing_message(),
+            "products": [{"name": name} for name in names],
+            "confidence": confidence,
+        }
+
+    def _final(self, response: str) -> dict[str, Any]:
+        # The product list travels as data so downstream agents skip parsing prose
+        content, products = split_products(response)
+        return {"is_task_complete": True, "content": content, "products": products}
+
     async def stream(
         self, query: str, session_id: str
     ) -> AsyncIterable[dict[str, Any]]:
@@ -57,9 +87,34 @@ class productRecommenderAgent:
                 session_id=session_id,
             )
 
+        # Follow-up turns depend on the conversation, only first turns are cached
+        use_cache = self._cache is not None and not session.events
+        if use_cache:
+            cached = self._cache.get(query)
+            if cached is not None:
+                logger.info(f"Served from response cache: {self._cache.stats()}")
+                yield self._final(cached)
+                return
+
+        start = time.perf_counter()
+        text = ""
+        announced: list[str] = []
         async for event in self._runner.run_async(
-            user_id=self._user_id, session_id=session.id, new_message=content
+            user_id=self._user_id,
+            session_id=session.id,
+            new_message=content,
+            run_config=self._run_config,
         ):
+            if event.partial:
+                if event.content and event.content.parts:
+                    text += "".join(p.text for p in event.content.parts if p.text)
+                # Only complete lines, a name can be cut mid stream
+                names, confidence = extract_products(text[: text.rfind("\n") + 1])
+                if any(name not in announced for name in names):
+                    announced = names
+                    yield self._announce(names, confidence)
+                continue
+
             if event.is_final_response():
                 response = ""
                 if event.content and event.content.parts:
@@ -72,7 +127,9 @@ class productRecommenderAgent:
                                 response = json.dumps(p.function_response.model_dump())
                                 break
 
-                yield {"is_task_complete": True, "content": response}
+                if use_cache and response:
+                    self._cache.put(query, response, time.perf_counter() - start)
+                yield self._final(response)
             else:
                 yield {
                     "is_task_complete": False,
@@ -4,6 +4,7 @@ from a2a.server.events.event_queue import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.utils.errors import ServerError
 from a2a.types import (
+    DataPart,
     InvalidParamsError,
     Part,
     TaskState,
@@ -29,15 +30,26 @@ class productRecommenderAgentExecutor(AgentExecutor):
                 is_task_complete = item["is_task_complete"]
 
                 if not is_task_complete:
+                    parts = [Part(root=TextPart(text=item["updates"]))]
+                    # Products named so far, callers may start on them early
+                    if item.get("products"):
+                        data = {
+                            "products": item["products"],
+                            "confidence": item["confidence"],
+                            "partial": True,
+                        }
+                        parts.append(Part(root=DataPart(data=data)))
                     await task_updater.update_status(
                         TaskState.working,
-                        message=task_updater.new_agent_message(
-                            [Part(root=TextPart(text=item["updates"]))]
-                        ),
+                        message=task_updater.new_agent_message(parts),
                     )
                     continue
 
                 parts = [Part(root=TextPart(text=str(item["content"])))]
+                if item.get("products"):
+                    parts.append(
+                        Part(root=DataPart(data={"products": item["products"]}))
+                    )
                 await task_updater.add_artifact(parts)
                 await task_updater.complete()
                 break
@@ -0,0 +1,231 @@
+import numpy as np
+import logging
+import time
+import zlib
+import os
+import re
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+CACHE_ENABLED = os.getenv("RECOMMENDER_CACHE", "1") == "1"
+CACHE_TTL = float(os.getenv("RECOMMENDER_CACHE_TTL", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("RECOMMENDER_CACHE_MAX_ENTRIES", "20000"))
+CACHE_THRESHOLD = float(os.getenv("RECOMMENDER_CACHE_THRESHOLD", "0.85"))
+EMBEDDING_DIM = 256
+
+SYNONYMS = {
+    "below": "under",
+    "within": "under",
+    "upto": "under",
+    "cheaper": "under",
+    "great": "good",
+    "excellent": "good",
+    "best": "good",
+    "nice": "good",
+    "decent": "good",
+    "mobile": "phone",
+    "smartphone": "phone",
+    "cam": "camera",
+    "cameras": "camera",
+    "phones": "phone",
+    "tvs": "tv",
+    "television": "tv",
+    "televisions": "tv",
+    "laptops": "laptop",
+    "tablets": "tablet",
+    "watches": "watch",
+    "smartwatch": "watch",
+    "smartwatches": "watch",
+    "earphones": "earbuds",
+    "headphone": "headphones",
+    "speakers": "speaker",
+    "monitors": "monitor",
+}
+PHRASES = {
+    "less than": "under",
+    "up to": "under",
+    "not more than": "under",
+    "no more than": "under",
+    "battery life": "battery",
+}
+# Words naming a different product when they differ, like model codes
+BRANDS = set(
+    "samsung apple iphone oneplus xiaomi redmi realme poco vivo oppo motorola "
+    "moto nokia google pixel nothing iqoo honor huawei sony lg asus lenovo hp "
+    "dell acer".split()
+)
+MODEL_WORDS = set(
+    "pro max plus ultra mini lite fe neo prime air note edge fold flip".split()
+)
+# Kinds of product, a phone answer doesn't do for a tv
+CATEGORIES = set(
+    "phone tv laptop tablet watch earbuds headphones speaker monitor printer "
+    "router keyboard mouse refrigerator fridge".split()
+)
+STOPWORDS = set(
+    "i me my want need looking for a an the with and of to in is it please "
+    "suggest some any rs inr rupees around that has have which prefer".split()
+)
+
+# Not inside a word, "s24" is a model and not an amount
+_AMOUNT = re.compile(
+    r"(?<![a-z0-9])(?:₹|rs\.?\s*|inr\s*)?(\d[\d,]*(?:\.\d+)?)\s*(k|lakh|l)?\b"
+)
+# "max 20000" is a budget, "pro max" a model
+_MAX_BUDGET = re.compile(r"\bmax(?:imum)?\s+(?=(?:₹|rs|inr)?\s*\d)")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _normalize_amount(match: re.Match) -> str:
+    value = float(match.group(1).replace(",", ""))
+    unit = match.group(2)
+    if unit == "k":
+        value *= 1000
+    elif unit in ("lakh", "l"):
+        value *= 100000
+    return f" {int(value)} "
+
+
+def normalize_query(query: str) -> str:
+    text = query.lower()
+    for phrase, replacement in PHRASES.items():
+        text = text.replace(phrase, replacement)
+    text = _MAX_BUDGET.sub("under ", text)
+    text = _AMOUNT.sub(_normalize_amount, text)
+    words = [SYNONYMS.get(w, w) for w in _WORD.findall(text)]
+    return " ".join(w for w in words if w not in STOPWORDS)
+
+
+def embed(normalized: str) -> np.ndarray:
+    # Hashed word, word-pair and character trigram features, L2 normalized
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    words = normalized.split()
+    features = words + [" ".join(pair) for pair in zip(words, words[1:])]
+    padded = f" {normalized} "
+    features += [padded[i : i + 3] for i in range(len(padded) - 2)]
+    for feature in features:
+        h = zlib.crc32(feature.encode())
+        vector[h % EMBEDDING_DIM] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def identity_tokens(normalized: str) -> frozenset:
+    # Must match exactly: budgets and sizes ("under 25000" != "under 65000"),
+    # model codes ("s24" != "a24"), brands and variants ("pro" != "pro max"),
+    # and the kind of product ("phone" != "tv")
+    return frozenset(
+        w
+        for w in normalized.split()
+        if any(c.isdigit() for c in w)
+        or w in BRANDS
+        or w in MODEL_WORDS
+        or w in CATEGORIES
+    )
+
+
+class SemanticResponseCache:
+    """
+    Response cache matching exact normalized queries and near duplicates.
+
+    Embeddings live in one preallocated matrix so a lookup is a single
+    matrix-vector product, whatever the number of entries.
+    """
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        threshold: float = CACHE_THRESHOLD,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._vectors = np.zeros((max_entries, EMBEDDING_DIM), dtype=np.float32)
+        self._created = np.full(max_entries, -np.inf)
+        self._last_used = np.full(max_entries, -np.inf)
+        self._keys: list[str | None] = [None] * max_entries
+        self._values: list[str | None] = [None] * max_entries
+        self._latency = np.zeros(max_entries)
+        self._rows: dict[str, int] = {}
+        self._size = 0
+        self.counters = {
+            "lookups": 0,
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "saved_seconds": 0.0,
+        }
+
+    def _hit(self, row: int, kind: str, now: float) -> str:
+        self._last_used[row] = now
+        self.counters[kind] += 1
+        self.counters["saved_seconds"] += float(self._latency[row])
+        return self._values[row]
+
+    def get(self, query: str) -> str | None:
+        self.counters["lookups"] += 1
+        now = time.time()
+        normalized = normalize_query(query)
+
+        row = self._rows.get(normalized)
+        if row is not None and now - self._created[row] < self.ttl:
+            return self._hit(row, "exact_hits", now)
+
+        if self._size:
+            vector = embed(normalized)
+            scores = self._vectors[: self._size] @ vector
+            scores[now - self._created[: self._size] >= self.ttl] = -1.0
+            identity = identity_tokens(normalized)
+            # Check the few best candidates for the same products and budget
+            best = np.argpartition(scores, -min(5, self._size))[-5:]
+            for row in best[np.argsort(scores[best])[::-1]]:
+                if scores[row] < self.threshold:
+                    break
+                if identity_tokens(self._keys[row]) == identity:
+                    logger.info(
+                        f"Semantic cache hit ({scores[row]:.2f}): "
+                        f"'{normalized}' ~ '{self._keys[row]}'"
+                    )
+                    return self._hit(int(row), "semantic_hits", now)
+
+        self.counters["misses"] += 1
+        return None
+
+    def _free_row(self, now: float) -> int:
+        if self._size < self.max_entries:
+            self._size += 1
+            return self._size - 1
+
+        # Expired entries go first, then the least recently used
+        expired = np.flatnonzero(now - self._created >= self.ttl)
+        row = int(expired[0]) if len(expired) else int(np.argmin(self._last_used))
+        del self._rows[self._keys[row]]
+        self.counters["evictions"] += 1
+        return row
+
+    def put(self, query: str, response: str, latency: float):
+        now = time.time()
+        normalized = normalize_query(query)
+        row = self._rows.get(normalized)
+        if row is None:
+            row = self._free_row(now)
+            self._rows[normalized] = row
+            self._keys[row] = normalized
+            self._vectors[row] = embed(normalized)
+        self._values[row] = response
+        self._latency[row] = latency
+        self._created[row] = now
+        self._last_used[row] = now
+
+    def stats(self) -> dict:
+        hits = self.counters["exact_hits"] + self.counters["semantic_hits"]
+        lookups = self.counters["lookups"]
+        return {
+            **self.counters,
+            "saved_seconds": round(self.counters["saved_seconds"], 2),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._rows),
+        }
@@ -0,0 +1,46 @@
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+)
+from agent import productRecommenderAgent
+from agent_executor import productRecommenderAgentExecutor
+from remote_agents.common.serving import app_from_env, build_app
+from starlette.applications import Starlette
+
+# Options of `python __main__.py`, handed to worker processes
+SERVER_OPTIONS_ENV = "RECOMMENDER_SERVER_OPTIONS"
+
+
+def create_app(
+    host: str = "localhost",
+    port: int = 10003,
+) -> Starlette:
+    capabilities = AgentCapabilities(streaming=True)
+    skill = AgentSkill(
+        id="product_recommender_agent",
+        name="product_recommender_agent",
+        description=("Suggest products based on the user specifications"),
+        tags=["suggest", "feature", "idea"],
+        examples=[
+            "I want a smartphone under ₹25,000 with a great camera and good battery. I prefer Samsung."
+        ],
+    )
+
+    agent_card = AgentCard(
+        name="product_recommender_agent",
+        description=("Suggest products based on the user specifications"),
+        url=f"http://{host}:{port}/",
+        version="1.0.0",
+        defaultInputModes=productRecommenderAgent.SUPPORTED_CONTENT_TYPES,
+        defaultOutputModes=productRecommenderAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=[skill],
+    )
+
+    app = build_app(agent_card, productRecommenderAgentExecutor())
+    return app
+
+
+def create_app_from_env() -> Starlette:
+    return app_from_env(create_app, SERVER_OPTIONS_ENV)
@@ -0,0 +1,39 @@
+import json
+import re
+
+PRODUCTS_INSTRUCTION = """
+After the suggestions, add a ```json block listing the suggested products as
+{"products": [{"brand": "...", "model": "...", "specs": {"<spec>": "<value>"}}]}
+Use the full model name (for example "Galaxy F54 5G") and only the key specs.
+"""
+
+_JSON_BLOCK = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def _clean_product(product) -> dict | None:
+    if not isinstance(product, dict) or not str(product.get("model", "")).strip():
+        return None
+    brand = str(product.get("brand", "")).strip()
+    model = str(product["model"]).strip()
+    specs = product.get("specs") or {}
+    if not isinstance(specs, dict):
+        specs = {"details": specs}
+    name = model
+    if brand and not model.lower().startswith(brand.lower()):
+        name = f"{brand} {model}"
+    return {"name": name, "brand": brand, "model": model, "specs": specs}
+
+
+def split_products(response: str) -> tuple[str, list[dict]]:
+    """Separates the prose answer from its ```json product list."""
+    for match in _JSON_BLOCK.finditer(response):
+        try:
+            data = json.loads(match.group(1))
+        except ValueError:
+            continue
+        if not isinstance(data, dict) or not isinstance(data.get("products"), list):
+            continue
+        products = [p for p in map(_clean_product, data["products"]) if p]
+        prose = (response[: match.start()] + response[match.end() :]).strip()
+        return prose, products
+    return response, []
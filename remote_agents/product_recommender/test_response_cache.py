@@ -0,0 +1,46 @@
+from response_cache import SemanticResponseCache, identity_tokens, normalize_query
+import pytest
+
+DIFFERENT_PRODUCTS = [
+    (
+        "best samsung galaxy s24 under 80000 with good camera",
+        "best samsung galaxy a24 under 80000 with good camera",
+    ),
+    ("iphone 15 pro under 1.5 lakh", "iphone 15 pro max under 1.5 lakh"),
+    ("phones under 25000 with good camera", "phones under 65000 with good camera"),
+    ("oneplus phone under 30000", "xiaomi phone under 30000"),
+    (
+        "samsung phone under 50000 with good camera",
+        "samsung tv under 50000 with good camera",
+    ),
+    ("sony headphones under 10000", "sony speakers under 10000"),
+]
+SAME_PRODUCTS = [
+    ("phones under 20k with good camera", "mobile below 20000 with great camera"),
+    ("best samsung galaxy s24 with good camera", "samsung galaxy s24 good camera"),
+    ("iphone 15 pro max under 1.5 lakh", "iphone 15 pro max within 150000"),
+    ("lenovo laptops below 60k for coding", "lenovo laptop under 60000 for coding"),
+]
+
+
+def test_model_codes_are_not_amounts():
+    assert normalize_query("Samsung Galaxy S24 under 80k") == (
+        "samsung galaxy s24 under 80000"
+    )
+    assert "a24" in normalize_query("galaxy a24")
+    assert normalize_query("max 20000") == "under 20000"
+    assert "max" in identity_tokens(normalize_query("iphone 15 pro max"))
+
+
+@pytest.mark.parametrize("cached, query", DIFFERENT_PRODUCTS)
+def test_different_products_miss(cached, query):
+    cache = SemanticResponseCache(max_entries=8)
+    cache.put(cached, "answer", latency=1.0)
+    assert cache.get(query) is None
+
+
+@pytest.mark.parametrize("cached, query", SAME_PRODUCTS)
+def test_rephrased_query_hits(cached, query):
+    cache = SemanticResponseCache(max_entries=8)
+    cache.put(cached, "answer", latency=1.0)
+    assert cache.get(query) == "answer"
@@ -1,14 +1,27 @@
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.sessions import InMemorySessionService
+from remote_agents.common.stores import build_artifact_service, build_session_service
 from google.adk.runners import Runner
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.tools import google_search
 from typing import Any, AsyncIterable
 from google.genai import types
+from remote_agents.common.product_extractor import extract_products
+from review_cache import ReviewCache
+import logging
 import asyncio
+import time
 import json
+import uuid
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Concurrent per-product review searches, and the extraction confidence
+# needed to split the query instead of sending it whole
+REVIEW_CONCURRENCY = int(os.getenv("REVIEW_CONCURRENCY", "4"))
+SPLIT_MIN_CONFIDENCE = float(os.getenv("REVIEW_SPLIT_MIN_CONFIDENCE", "0.7"))
 
 
 class reviewAnalysisAgent:
@@ -20,9 +33,11 @@ class reviewAnalysisAgent:
         self._runner = Runner(
             app_name=self._agent.name,
             agent=self._agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            artifact_service=build_artifact_service(),
+            session_service=build_session_service(),
         )
+        self._cache = ReviewCache()
+        self._limit = asyncio.Semaphore(REVIEW_CONCURRENCY)
 
     def get_processing_message(self) -> str:
         return "Analyzing data..."
@@ -41,10 +56,88 @@ class reviewAnalysisAgent:
             tools=[google_search],
         )
 
+    def _final_response(self, event) -> str:
+        response = ""
+        if event.content and event.content.parts:
+            response = "\n".join([p.text for p in event.content.parts if p.text])
+            if not response:
+                for p in event.content.parts:
+                    if p.function_response:
+                        response = json.dumps(p.function_response.model_dump())
+                        break
+        return response
+
+    async def _review_product(self, product: str) -> str:
+        # Every product gets its own short-lived session
+        async with self._limit:
+            session = await self._runner.session_service.create_session(
+                app_name=self._agent.name,
+                user_id=self._user_id,
+                state={},
+                session_id=f"review_{uuid.uuid4().hex}",
+            )
+            try:
+                text = f"Share the reviews of {product}."
+                content = types.Content(
+                    role="user", parts=[types.Part.from_text(text=text)]
+                )
+                response = ""
+                async for event in self._runner.run_async(
+                    user_id=self._user_id, session_id=session.id, new_message=content
+                ):
+                    if event.is_final_response():
+                        response = self._final_response(event)
+            finally:
+                await self._runner.session_service.delete_session(
+                    app_name=self._agent.name,
+                    user_id=self._user_id,
+                    session_id=session.id,
+                )
+
+        if response:
+            self._cache.put(product, response)
+        return response
+
+    async def _review_products(self, products: list[str]) -> str:
+        start = time.perf_counter()
+        reviews = {product: self._cache.get(product) for product in products}
+        misses = [product for product, review in reviews.items() if review is None]
+
+        # Only cache misses are searched, all at once under the semaphore
+        results = await asyncio.gather(
+            *(self._review_product(product) for product in misses),
+            return_exceptions=True,
+        )
+        for product, result in zip(misses, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Review search failed for '{product}': {result}")
+                result = f"Reviews unavailable ({result})"
+            reviews[product] = result or "No reviews found."
+
+        logger.info(
+            f"Reviewed {len(products)} products ({len(misses)} searched) "
+            f"in {time.perf_counter() - start:.2f}s, cache: {self._cache.stats()}"
+        )
+        return "\n\n".join(
+            f"**{product}**\n{review}" for product, review in reviews.items()
+        )
+
     async def stream(
         self, query: str, session_id: str
     ) -> AsyncIterable[dict[str, Any]]:
 
+        products, confidence = extract_products(query)
+        if products and confidence >= SPLIT_MIN_CONFIDENCE:
+            yield {
+                "is_task_complete": False,
+                "updates": self.get_processing_message(),
+            }
+            yield {
+                "is_task_complete": True,
+                "content": await self._review_products(products),
+            }
+            return
+
         session = await self._runner.session_service.get_session(
             app_name=self._agent.name,
             user_id=self._user_id,
@@ -64,18 +157,7 @@ class reviewAnalysisAgent:
             user_id=self._user_id, session_id=session.id, new_message=content
         ):
             if event.is_final_response():
-                response = ""
-                if event.content and event.content.parts:
-                    response = "\n".join(
-                        [p.text for p in event.content.parts if p.text]
-                    )
-                    if not response:
-                        for p in event.content.parts:
-                            if p.function_response:
-                                response = json.dumps(p.function_response.model_dump())
-                                break
-
-                yield {"is_task_complete": True, "content": response}
+                yield {"is_task_complete": True, "content": self._final_response(event)}
             else:
                 yield {
                     "is_task_complete": False,
@@ -7,6 +7,7 @@ from a2a.types import (
     InvalidParamsError,
     Part,
     Task,
+    TaskState,
     TextPart,
     UnsupportedOperationError,
 )
@@ -0,0 +1,41 @@
+from remote_agents.common.product_extractor import normalize_product_name
+from collections import OrderedDict
+import time
+import os
+
+REVIEW_CACHE_TTL = float(os.getenv("REVIEW_CACHE_TTL", "21600"))
+REVIEW_CACHE_MAX_ENTRIES = int(os.getenv("REVIEW_CACHE_MAX_ENTRIES", "2048"))
+
+
+class ReviewCache:
+    """Bounded LRU of per-product review summaries with a TTL."""
+
+    def __init__(
+        self, ttl: float = REVIEW_CACHE_TTL, max_entries: int = REVIEW_CACHE_MAX_ENTRIES
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, product_name: str) -> str | None:
+        key = normalize_product_name(product_name)
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[1] >= self.ttl:
+            self._entries.pop(key, None)
+            self.counters["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return entry[0]
+
+    def put(self, product_name: str, summary: str):
+        key = normalize_product_name(product_name)
+        self._entries[key] = (summary, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def stats(self) -> dict:
+        return {**self.counters, "entries": len(self._entries)}
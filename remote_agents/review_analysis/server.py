@@ -0,0 +1,44 @@
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    AgentSkill,
+)
+from agent import reviewAnalysisAgent
+from agent_executor import reviewAnalysisAgentExecutor
+from remote_agents.common.serving import app_from_env, build_app
+from starlette.applications import Starlette
+
+# Options of `python __main__.py`, handed to worker processes
+SERVER_OPTIONS_ENV = "REVIEW_ANALYSIS_SERVER_OPTIONS"
+
+
+def create_app(
+    host: str = "localhost",
+    port: int = 10002,
+) -> Starlette:
+    capabilities = AgentCapabilities(streaming=False)
+    skill = AgentSkill(
+        id="review_analysis_agent",
+        name="review_analysis_agent",
+        description=("Fetches customer reviews for the products"),
+        tags=["review", "customer feedback", "ratings"],
+        examples=["Share the reviews of Samsung Galaxy F54 5G."],
+    )
+
+    agent_card = AgentCard(
+        name="review_analysis_agent",
+        description=("Fetches customer reviews for the products"),
+        url=f"http://{host}:{port}/",
+        version="1.0.0",
+        defaultInputModes=reviewAnalysisAgent.SUPPORTED_CONTENT_TYPES,
+        defaultOutputModes=reviewAnalysisAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=[skill],
+    )
+
+    app = build_app(agent_card, reviewAnalysisAgentExecutor())
+    return app
+
+
+def create_app_from_env() -> Starlette:
+    return app_from_env(create_app, SERVER_OPTIONS_ENV)
@@ -0,0 +1,273 @@
+from dataclasses import dataclass, field
+from collections import deque
+import logging
+import asyncio
+import random
+import httpx
+import time
+import os
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "10"))
+HEALTH_TIMEOUT = float(os.getenv("REPLICA_HEALTH_TIMEOUT", "2"))
+# Consecutive failures before a replica is taken out, and for how long
+EJECT_AFTER = int(os.getenv("REPLICA_EJECT_AFTER", "3"))
+EJECT_FOR = float(os.getenv("REPLICA_EJECT_FOR", "30"))
+AGENT_CARD_PATH = "/.well-known/agent-card.json"
+# Names of this machine a replica URL or agent card may use interchangeably
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def replica_urls(env_var: str, default: str) -> list[str]:
+    # "http://localhost:10001,http://localhost:10011"
+    urls = os.getenv(env_var, default).split(",")
+    return [url.strip().rstrip("/") for url in urls if url.strip()]
+
+
+def endpoint(url: httpx.URL) -> tuple[str, int | None]:
+    # localhost:10001 and 127.0.0.1:10001 are the same replica
+    host = "localhost" if url.host in LOCAL_HOSTS else url.host
+    return host, url.port or DEFAULT_PORTS.get(url.scheme)
+
+
+@dataclass
+class Replica:
+    url: httpx.URL
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    latency: float = 0.0
+
+    @property
+    def ejected(self) -> bool:
+        return time.monotonic() < self.ejected_until
+
+    def stats(self) -> dict:
+        return {
+            "url": str(self.url),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejected": self.ejected,
+            "latency": round(self.latency, 3),
+        }
+
+
+@dataclass
+class ReplicaPool:
+    """
+    Replicas of one remote agent, routed by least outstanding requests.
+
+    A replica failing `eject_after` requests or health checks in a row is
+    left out for `eject_for` seconds. When every replica is out the least
+    recently ejected one is still tried, rather than failing outright.
+    """
+
+    name: str
+    urls: list[str]
+    eject_after: int = EJECT_AFTER
+    eject_for: float = EJECT_FOR
+    replicas: list[Replica] = field(init=False)
+    decisions: deque = field(init=False)
+
+    def __post_init__(self):
+        self.replicas = [Replica(url=httpx.URL(url)) for url in self.urls]
+        self.decisions = deque(maxlen=100)
+
+    def owns(self, url: httpx.URL) -> bool:
+        return any(endpoint(r.url) == endpoint(url) for r in self.replicas)
+
+    def pick(self, exclude: tuple = ()) -> Replica | None:
+        candidates = [r for r in self.replicas if r not in exclude]
+        if not candidates:
+            return None
+        healthy = [r for r in candidates if not r.ejected]
+        if healthy:
+            # Random tie break, so equal replicas share the load
+            fewest = min(r.outstanding for r in healthy)
+            replica = random.choice([r for r in healthy if r.outstanding == fewest])
+        else:
+            replica = min(candidates, key=lambda r: r.ejected_until)
+        load = {str(r.url): r.outstanding for r in self.replicas}
+        self.decisions.append(
+            {"time": time.time(), "replica": str(replica.url), "load": load}
+        )
+        logger.debug(f"{self.name}: routed to {replica.url}, load {load}")
+        return replica
+
+    def record_success(self, replica: Replica, latency: float | None = None):
+        replica.consecutive_failures = 0
+        if replica.ejected_until:
+            logger.info(f"{self.name}: {replica.url} is back")
+            replica.ejected_until = 0.0
+        if latency is not None:
+            # Exponentially weighted, recent requests count more
+            replica.latency = (
+                0.8 * replica.latency + 0.2 * latency if replica.latency else latency
+            )
+
+    def record_failure(self, replica: Replica, reason: str):
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= self.eject_after and not replica.ejected:
+            logger.warning(
+                f"{self.name}: ejecting {replica.url} "
+                f"for {self.eject_for:g}s ({reason})"
+            )
+            replica.ejected_until = time.monotonic() + self.eject_for
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [r.stats() for r in self.replicas],
+            "recent_decisions": list(self.decisions)[-10:],
+        }
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    # A request is outstanding until its (possibly streamed) body is closed
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close:
+                self._on_close()
+                self._on_close = None
+
+
+class ReplicaTransport(httpx.AsyncBaseTransport):
+    """Sends every request for a pooled agent to the replica its pool picks."""
+
+    def __init__(self, router: "ReplicaRouter"):
+        self._router = router
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        pool = self._router.pool_for(request.url)
+        if pool is None:
+            return await self._router.transport.handle_async_request(request)
+
+        self._router.ensure_health_checks()
+        tried = []
+        while True:
+            replica = pool.pick(exclude=tuple(tried))
+            if replica is None:
+                raise httpx.ConnectError(
+                    f"No replica of {pool.name} reachable", request=request
+                )
+            tried.append(replica)
+            request.url = request.url.copy_with(
+                scheme=replica.url.scheme,
+                host=replica.url.host,
+                port=replica.url.port,
+            )
+            request.headers["Host"] = replica.url.netloc.decode()
+
+            replica.outstanding += 1
+            replica.requests += 1
+            start = time.perf_counter()
+            try:
+                transport = self._router.transport
+                response = await transport.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # Nothing was sent yet, another replica can take the request
+                replica.outstanding -= 1
+                pool.record_failure(replica, repr(e))
+                continue
+            except httpx.HTTPError as e:
+                replica.outstanding -= 1
+                pool.record_failure(replica, repr(e))
+                raise
+            except BaseException:
+                # Cancelled by a deadline, not the replica's fault
+                replica.outstanding -= 1
+                raise
+
+            if response.status_code >= 500:
+                pool.record_failure(replica, f"status {response.status_code}")
+            else:
+                pool.record_success(replica, time.perf_counter() - start)
+
+            def release(replica=replica):
+                replica.outstanding -= 1
+
+            response.stream = _TrackedStream(response.stream, release)
+            return response
+
+
+class ReplicaRouter:
+    """
+    Replica pools for the remote agents, with periodic health checks.
+
+    `client()` returns an httpx client for RemoteA2aAgent or the A2A
+    client; requests to any replica of a pool are routed within that pool.
+    """
+
+    def __init__(
+        self,
+        pools: dict[str, list[str]],
+        health_interval: float = HEALTH_INTERVAL,
+    ):
+        self.pools = [ReplicaPool(name, urls) for name, urls in pools.items()]
+        self.health_interval = health_interval
+        self.transport = httpx.AsyncHTTPTransport()
+        self._health_task: asyncio.Task | None = None
+
+    def pool_for(self, url: httpx.URL) -> ReplicaPool | None:
+        for pool in self.pools:
+            if pool.owns(url):
+                return pool
+        return None
+
+    def card_url(self, name: str) -> str:
+        # Any replica's card will do, its requests are routed by the pool
+        pool = next(pool for pool in self.pools if pool.name == name)
+        return f"{pool.urls[0]}{AGENT_CARD_PATH}"
+
+    def client(self, timeout: float) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=ReplicaTransport(self), timeout=httpx.Timeout(timeout)
+        )
+
+    def ensure_health_checks(self):
+        task = self._health_task
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def check_health(self):
+        async with httpx.AsyncClient(timeout=HEALTH_TIMEOUT) as client:
+
+            async def check(pool: ReplicaPool, replica: Replica):
+                try:
+                    response = await client.get(f"{replica.url}{AGENT_CARD_PATH}")
+                    response.raise_for_status()
+                except httpx.HTTPError as e:
+                    pool.record_failure(replica, f"health check: {e!r}")
+                else:
+                    pool.record_success(replica)
+
+            await asyncio.gather(
+                *(check(pool, r) for pool in self.pools for r in pool.replicas)
+            )
+
+    async def _health_loop(self):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_interval)
+
+    def stats(self) -> dict:
+        return {pool.name: pool.stats() for pool in self.pools}
@@ -0,0 +1,76 @@
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import Session
+from google.genai import types
+from typing import AsyncIterator
+import asyncio
+import time
+import os
+
+# Shopper turns run at once, later ones wait in arrival order
+SHOPPER_CONCURRENCY = int(os.getenv("SHOPPER_CONCURRENCY", "4"))
+
+
+class ShopperRunner:
+    """
+    Runs the shopper for many users at once, each in their own session.
+
+    At most `concurrency` turns run at a time and the rest queue for a
+    slot. A session is created on its first message and reused after.
+    """
+
+    def __init__(self, runner: Runner, concurrency: int = SHOPPER_CONCURRENCY):
+        self.runner = runner
+        self.concurrency = concurrency
+        self._slots = asyncio.Semaphore(concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.turns = 0
+        self.queued_seconds = 0.0
+
+    @property
+    def full(self) -> bool:
+        return self.running + self.waiting >= self.concurrency
+
+    async def session(self, user_id: str, session_id: str) -> Session:
+        service = self.runner.session_service
+        session = await service.get_session(
+            app_name=self.runner.app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            session = await service.create_session(
+                app_name=self.runner.app_name, user_id=user_id, session_id=session_id
+            )
+        return session
+
+    async def run(
+        self, user_id: str, session_id: str, message: str
+    ) -> AsyncIterator[Event]:
+        queued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.queued_seconds += time.perf_counter() - queued
+        self.running += 1
+        try:
+            await self.session(user_id, session_id)
+            content = types.Content(role="user", parts=[types.Part(text=message)])
+            async for event in self.runner.run_async(
+                user_id=user_id, session_id=session_id, new_message=content
+            ):
+                yield event
+        finally:
+            self.running -= 1
+            self.turns += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "turns": self.turns,
+            "mean_queued_seconds": self.queued_seconds / max(self.turns, 1),
+        }